@@ -0,0 +1,142 @@
+"""Cross-request micro-batching for the local sentiment model.
+
+One worker thread owns the single LocalSentimentEngine for the process. Callers
+await ``classify(texts)``; their texts are queued, merged with whatever other
+requests arrive within ``max_wait`` seconds (up to ``max_batch`` texts), scored
+in one model pass, and split back per caller.
+
+With several uvicorn workers, run one dedicated inference process instead so
+the host holds a single copy of the model:
+
+    uvicorn analyzers.batch_server:inference_app --port 8100 --workers 1
+
+and point the API workers at it with LOCAL_INFERENCE_URL=http://127.0.0.1:8100.
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+
+from fastapi import FastAPI, Request
+
+from analyzers.local_engine import get_engine
+
+LOCAL_INFERENCE_URL = os.getenv("LOCAL_INFERENCE_URL", "")
+
+class MicroBatcher:
+    def __init__(self, engine, max_batch=64, max_wait=0.01):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.texts = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+                self._thread.start()
+
+    async def classify(self, texts):
+        """Score texts in a shared micro-batch and return their predictions in order"""
+        if not texts:
+            return []
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((list(texts), future, loop))
+        return await future
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        size = len(pending[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            texts = [text for item_texts, _, _ in pending for text in item_texts]
+            try:
+                predictions = self.engine.predict(texts)
+            except Exception as e:
+                for _, future, loop in pending:
+                    loop.call_soon_threadsafe(_resolve, future, None, e)
+                continue
+
+            self.batches += 1
+            self.texts += len(texts)
+            offset = 0
+            for item_texts, future, loop in pending:
+                chunk = predictions[offset:offset + len(item_texts)]
+                offset += len(item_texts)
+                loop.call_soon_threadsafe(_resolve, future, chunk, None)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+def _resolve(future, result, error):
+    # The caller may have gone away (cancelled request) while we were scoring
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+_batcher = None
+
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            get_engine(),
+            max_batch=int(os.getenv("LOCAL_BATCH_MAX_SIZE", "64")),
+            max_wait=float(os.getenv("LOCAL_BATCH_MAX_WAIT", "0.01")),
+        )
+    return _batcher
+
+def model_ready():
+    """Whether classify() can answer without loading the model first"""
+    return bool(LOCAL_INFERENCE_URL) or get_engine().loaded
+
+async def classify(texts):
+    """Per-text predictions from the dedicated inference process or the in-process batcher"""
+    if LOCAL_INFERENCE_URL:
+        from services.http_client import get_client
+        response = await get_client().post(f"{LOCAL_INFERENCE_URL}/classify", json={"texts": list(texts)}, timeout=60)
+        response.raise_for_status()
+        return response.json()["results"]
+    return await get_batcher().classify(texts)
+
+
+inference_app = FastAPI()
+
+@inference_app.post("/classify")
+async def classify_endpoint(request: Request):
+    body = await request.json()
+    return {"results": await get_batcher().classify(body.get("texts", []))}
+
+@inference_app.get("/stats")
+async def batcher_stats():
+    return get_batcher().stats()
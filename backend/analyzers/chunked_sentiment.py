@@ -0,0 +1,187 @@
+"""Map-reduce LLM analysis: the corpus is split into token-budgeted chunks,
+each chunk is analyzed by Gemini concurrently, and the partial JSON results
+are merged into one /analyze response.
+
+Only as many chunks are sent as the Gemini rate limit can start within the
+request budget; texts arrive most relevant first, so the tail is dropped.
+
+The reduce step is deterministic: scores are averaged weighted by each
+chunk's text count, counts are summed, and insights/recommendations are
+interleaved in chunk order with duplicates removed.
+"""
+import asyncio
+import os
+
+from analyzers.openrouter_sentiment import analyze_sentiment as analyze_llm_sentiment
+from analyzers.openrouter_sentiment import create_empty_response, estimate_tokens
+from services.rate_limit import limiter
+from services.resilience import time_remaining
+
+CHUNK_TOKEN_BUDGET = int(os.getenv("CHUNK_TOKEN_BUDGET", "1500"))
+CHUNK_CONCURRENCY = int(os.getenv("CHUNK_CONCURRENCY", "4"))
+CHUNK_TIMEOUT = float(os.getenv("CHUNK_TIMEOUT", "45"))
+CHUNK_RETRIES = int(os.getenv("CHUNK_RETRIES", "2"))
+CHUNK_RETRY_DELAY = 1.0
+# Expected seconds for one Gemini call; a chunk whose token would only arrive
+# later than this before the budget ends is not sent
+CHUNK_CALL_SECONDS = float(os.getenv("CHUNK_CALL_SECONDS", "10"))
+
+SCORE_FIELDS = ["score", "brand_awareness_score", "market_sentiment_score", "public_opinion_score"]
+COUNT_FIELDS = ["positive_count", "negative_count", "neutral_count"]
+CONFIDENCE_LEVELS = ["low", "medium", "high"]
+MAX_LIST_ITEMS = 5
+
+def make_chunks(texts, token_budget=CHUNK_TOKEN_BUDGET):
+    """Pack texts in order into chunks of at most ``token_budget`` estimated tokens.
+
+    A text larger than the budget on its own gets a chunk to itself.
+    """
+    chunks, current, used = [], [], 0
+    for text in texts:
+        cost = estimate_tokens(text)
+        if current and used + cost > token_budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+def chunk_limit():
+    """How many chunk calls the Gemini rate limit can start in the time left"""
+    bucket = limiter("gemini").bucket
+    remaining = time_remaining()
+    window = CHUNK_TIMEOUT if remaining is None else remaining
+    return max(1, int(bucket.burst + bucket.rate * max(0.0, window - CHUNK_CALL_SECONDS)))
+
+async def analyze_chunk(chunk, company_data, slots):
+    """Gemini result for one chunk; None if it failed.
+
+    Errors are retried while time remains. A timed-out attempt is not: it has
+    been cancelled, and a retry would only run past the same deadline.
+    """
+    async with slots:
+        for attempt in range(CHUNK_RETRIES + 1):
+            remaining = time_remaining()
+            timeout = CHUNK_TIMEOUT if remaining is None else min(CHUNK_TIMEOUT, remaining)
+            try:
+                response = await asyncio.wait_for(analyze_llm_sentiment(chunk, company_data), timeout)
+            except asyncio.TimeoutError:
+                print(f"⏱️ Chunk of {len(chunk)} texts timed out after {timeout:.1f}s")
+                return None
+            if response["status"] == "success":
+                return response["analysis_result"]
+            delay = CHUNK_RETRY_DELAY * 2 ** attempt
+            remaining = time_remaining()
+            if attempt == CHUNK_RETRIES or (remaining is not None and remaining < delay + CHUNK_CALL_SECONDS):
+                break
+            await asyncio.sleep(delay)
+    return None
+
+async def analyze_sentiment(texts, company_data):
+    """Chunked analysis of ``texts``; "partial" status when some chunks failed"""
+    if not texts:
+        return create_empty_response(company_data)
+
+    chunks = make_chunks(texts)
+    limit = chunk_limit()
+    skipped = sum(len(chunk) for chunk in chunks[limit:])
+    chunks = chunks[:limit]
+    slots = asyncio.Semaphore(CHUNK_CONCURRENCY)
+    print(f"🧩 Chunked: {len(texts) - skipped} texts in {len(chunks)} chunks ({skipped} over the rate budget)")
+    results = await asyncio.gather(*(analyze_chunk(chunk, company_data, slots) for chunk in chunks))
+
+    parts = [(result, len(chunk)) for result, chunk in zip(results, chunks) if result is not None]
+    failed = len(chunks) - len(parts)
+    if not parts:
+        return {
+            "company_info": company_data,
+            "analysis_result": {"error": f"All {len(chunks)} chunks failed"},
+            "status": "error"
+        }
+
+    result = reduce_results(parts)
+    result["chunk_count"] = len(chunks)
+    result["failed_chunks"] = failed
+    result["skipped_texts"] = skipped
+    return {
+        "company_info": company_data,
+        "analysis_result": result,
+        "status": "partial" if failed else "success"
+    }
+
+async def analyze_items(items, company_data):
+    """Registry entry point: chunked analysis of ranked {"text", ...} items"""
+    return await analyze_sentiment([item["text"] for item in items], company_data)
+
+def reduce_results(parts):
+    """Merge [(chunk result, text count)] into one analysis_result"""
+    merged = {}
+    for field in SCORE_FIELDS:
+        value = weighted_mean((number(result.get(field)), weight) for result, weight in parts)
+        if value is not None:
+            merged[field] = round(value)
+    for field in COUNT_FIELDS:
+        merged[field] = sum(int(number(result.get(field)) or 0) for result, _ in parts)
+
+    score = merged.get("score", 50)
+    merged["sentiment"] = "positive" if score >= 60 else "negative" if score <= 40 else "neutral"
+    confidence = weighted_mean(
+        (CONFIDENCE_LEVELS.index(result["confidence_level"]) if result.get("confidence_level") in CONFIDENCE_LEVELS else None, weight)
+        for result, weight in parts
+    )
+    merged["confidence_level"] = CONFIDENCE_LEVELS[round(confidence)] if confidence is not None else "low"
+
+    # Quotes come from the most extreme chunk; ties go to the earlier chunk
+    by_score = [result for result, _ in parts if number(result.get("score")) is not None]
+    if by_score:
+        merged["most_positive"] = max(by_score, key=lambda result: number(result["score"])).get("most_positive")
+        merged["most_negative"] = min(by_score, key=lambda result: number(result["score"])).get("most_negative")
+
+    merged["key_insights"] = merge_lists(result.get("key_insights") for result, _ in parts)
+    merged["recommendations"] = merge_lists(result.get("recommendations") for result, _ in parts)
+    merged["topic_scores"] = merge_topics(parts)
+    return merged
+
+def merge_lists(lists, limit=MAX_LIST_ITEMS):
+    """Interleave lists in order (first item of each, then second, ...) without duplicates"""
+    lists = [items for items in lists if isinstance(items, list)]
+    merged, seen = [], set()
+    for position in range(max((len(items) for items in lists), default=0)):
+        for items in lists:
+            if position >= len(items):
+                continue
+            key = " ".join(str(items[position]).lower().split())
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(items[position])
+    return merged[:limit]
+
+def merge_topics(parts):
+    """Weighted mean score per topic, topics in order of first appearance"""
+    topics = {}
+    for result, weight in parts:
+        for entry in result.get("topic_scores") or []:
+            if isinstance(entry, dict) and entry.get("topic"):
+                topics.setdefault(str(entry["topic"]).lower(), []).append((number(entry.get("score")), weight))
+    merged = []
+    for topic, scores in topics.items():
+        value = weighted_mean(scores)
+        if value is not None:
+            merged.append({"topic": topic, "score": round(value)})
+    return merged
+
+def weighted_mean(pairs):
+    total = weights = 0.0
+    for value, weight in pairs:
+        if value is not None:
+            total += value * weight
+            weights += weight
+    return total / weights if weights else None
+
+def number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -1,7 +1,14 @@
-from openai import OpenAI
+import asyncio
+import json
+from functools import lru_cache
+from analyzers.sentiment_cache import cached_scores
 from config import OPENAI_API_KEY
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+@lru_cache(maxsize=1)
+def get_client():
+    """OpenAI client, created on first use rather than at import"""
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
 
 def analyze_sentiment(text_list):
     # Join list into a single string if needed
@@ -22,13 +29,35 @@ def analyze_sentiment(text_list):
     - most_positive: the most positive text input.
     """
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.3
-    )
-
-    return response.choices[0].message.content
-
+    def complete():
+        response = get_client().chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3
+        )
+        return response.choices[0].message.content
+
+    def score(texts):
+        # Parse before caching, so a malformed completion raises and is retried next time
+        from analyzers.openrouter_sentiment import extract_json
+        return [json.loads(extract_json(complete()))]
+
+    # The whole input is one cache entry in the shared sentiment cache; the
+    # "/json" model key keeps parsed results apart from older raw completions
+    return cached_scores([text], "gpt-4o/json", score)[0]
+
+async def analyze_items(items, company_data):
+    """Registry entry point: gpt-4o analysis of ranked {"text", ...} items"""
+    try:
+        result = await asyncio.to_thread(analyze_sentiment, [item["text"] for item in items])
+        status = "success"
+    except Exception as e:
+        print(f"Analysis error: {e}")
+        result, status = {"error": str(e)}, "error"
+    return {
+        "company_info": company_data,
+        "analysis_result": result,
+        "status": status
+    }
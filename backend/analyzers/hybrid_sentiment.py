@@ -0,0 +1,61 @@
+"""Tiered analysis: every text is scored by the local model, only a
+token-budgeted selection of the most polarized and relevant ones goes to
+Gemini for the qualitative fields, and the two are merged into the usual
+/analyze response."""
+import os
+
+from analyzers.batch_server import classify
+from analyzers.openrouter_sentiment import analyze_sentiment as analyze_llm_sentiment
+from analyzers.openrouter_sentiment import create_empty_response, estimate_tokens
+from analyzers.local_sentiment import local_summary, polarity
+
+HYBRID_TOKEN_BUDGET = int(os.getenv("HYBRID_TOKEN_BUDGET", "2000"))
+
+def select_for_llm(items, predictions, token_budget=HYBRID_TOKEN_BUDGET):
+    """Greedily pick the most polarized, most relevant texts that fit the token budget"""
+    max_relevance = max((item.get("relevance", 0) for item in items), default=0) or 1
+    ranked = sorted(
+        range(len(items)),
+        key=lambda i: abs(polarity(predictions[i])) + items[i].get("relevance", 0) / max_relevance,
+        reverse=True,
+    )
+
+    selected, used = [], 0
+    for i in ranked:
+        cost = estimate_tokens(items[i]["text"])
+        if used + cost > token_budget:
+            continue
+        selected.append(i)
+        used += cost
+
+    # Keep the original ordering so the prompt reads like the source feed
+    return [items[i]["text"] for i in sorted(selected)]
+
+async def analyze_sentiment(items, company_data):
+    """Hybrid analysis over {"text", "relevance"} items"""
+    if not items:
+        return create_empty_response(company_data)
+
+    predictions = await classify([item["text"] for item in items])
+    summary = local_summary(predictions)
+    selected = select_for_llm(items, predictions)
+    print(f"🧮 Hybrid: {len(items)} texts scored locally, {len(selected)} sent to the LLM")
+
+    response = await analyze_llm_sentiment(selected, company_data)
+
+    # Copy before merging: the LLM result may be a shared cache entry
+    if response["status"] == "success":
+        result = dict(response["analysis_result"])
+        status = "success"
+    else:
+        result = {"score": summary["local_score"], "error": response["analysis_result"].get("error")}
+        status = "partial"
+    result.update(summary)
+    result["analyzed_count"] = len(items)
+    result["llm_text_count"] = len(selected)
+
+    return {
+        "company_info": company_data,
+        "analysis_result": result,
+        "status": status
+    }
@@ -0,0 +1,113 @@
+import os
+import threading
+
+from analyzers.sentiment_cache import cached_scores
+from services.metrics import span
+
+MODEL_NAME = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+
+class LocalSentimentEngine:
+    """Batched RoBERTa sentiment classifier that loads its model on first use.
+
+    ``variant`` picks the runtime: "default" runs the stock PyTorch model,
+    "quantized" applies dynamic int8 quantization to the Linear layers, and
+    "onnx" exports the model to ONNX Runtime through optimum (if installed).
+    Texts are sorted by length before batching so each batch pads to a
+    similar length, and every text is truncated to ``max_length`` tokens.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, batch_size=32, max_length=128, variant="default"):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.variant = variant
+        self._tokenizer = None
+        self._model = None
+        self._labels = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def load(self):
+        with self._lock:
+            if self._model is not None:
+                return
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            if self.variant == "onnx":
+                from optimum.onnxruntime import ORTModelForSequenceClassification
+                model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+            else:
+                model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+                model.eval()
+                if self.variant == "quantized":
+                    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            self._labels = {int(i): label.lower() for i, label in model.config.id2label.items()}
+            self._tokenizer = tokenizer
+            self._model = model
+            print(f"✅ Loaded local sentiment model: {self.model_name} ({self.variant})")
+
+    @property
+    def model_id(self):
+        return f"{self.model_name}:{self.variant}:{self.max_length}"
+
+    def predict(self, texts):
+        """Classify texts, returning one {label, confidence, scores} dict per text in input order.
+
+        Texts already scored by this model (in any process) come from the shared
+        sentiment cache; only the misses reach the model.
+        """
+        if not texts:
+            return []
+        return cached_scores(list(texts), self.model_id, self._predict)
+
+    def _predict(self, texts):
+        self.load()
+        with span("local_model"):
+            return self._run(texts)
+
+    def _run(self, texts):
+        import torch
+
+        results = [None] * len(texts)
+        # Length bucketing: neighbours in a batch have similar token counts
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.batch_size):
+            batch_ids = order[start:start + self.batch_size]
+            encoded = self._tokenizer(
+                [texts[i] for i in batch_ids],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="pt",
+            )
+            with torch.inference_mode():
+                probs = self._model(**encoded).logits.softmax(dim=-1).tolist()
+            for i, row in zip(batch_ids, probs):
+                best = max(range(len(row)), key=row.__getitem__)
+                results[i] = {
+                    "label": self._labels[best].capitalize(),
+                    "confidence": round(row[best], 2),
+                    "scores": {self._labels[j]: round(p, 4) for j, p in enumerate(row)},
+                }
+        return results
+
+
+_engine = None
+
+def get_engine():
+    """Process-wide engine configured from LOCAL_SENTIMENT_* environment variables"""
+    global _engine
+    if _engine is None:
+        _engine = LocalSentimentEngine(
+            model_name=os.getenv("LOCAL_SENTIMENT_MODEL", MODEL_NAME),
+            batch_size=int(os.getenv("LOCAL_SENTIMENT_BATCH_SIZE", "32")),
+            max_length=int(os.getenv("LOCAL_SENTIMENT_MAX_LENGTH", "128")),
+            variant=os.getenv("LOCAL_SENTIMENT_VARIANT", "default"),
+        )
+    return _engine
@@ -1,25 +1,43 @@
-from transformers import pipeline
-
-# Load the sentiment analysis model once
-model_name = "cardiffnlp/twitter-roberta-base-sentiment-latest"
-sentiment_pipeline = pipeline("sentiment-analysis", model=model_name)
+from analyzers.local_engine import get_engine
 
 def analyze_sentiment(texts: list[str], company_data: dict) -> dict:
-    results = []
+    # The model loads lazily on the first call and scores texts in batches
+    return build_response(texts, get_engine().predict(texts), company_data)
+
+async def analyze_sentiment_async(texts: list[str], company_data: dict) -> dict:
+    """Same as analyze_sentiment, batched with other in-flight requests"""
+    from analyzers.batch_server import classify
+    return build_response(texts, await classify(texts), company_data)
+
+async def analyze_items(items, company_data):
+    """Registry entry point: local analysis of ranked {"text", ...} items"""
+    return await analyze_sentiment_async([item["text"] for item in items], company_data)
 
-    for idx, text in enumerate(texts, 1):
-        prediction = sentiment_pipeline(text)[0]
-        label = prediction["label"]
-        confidence = round(prediction["score"], 2)
+def polarity(prediction):
+    scores = prediction.get("scores", {})
+    return scores.get("positive", 0.0) - scores.get("negative", 0.0)
 
-        # Print the result
-        print(f"[{idx}] Text: {text}\n    Sentiment: {label} (Confidence: {confidence})\n")
+def local_summary(predictions):
+    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    for prediction in predictions:
+        counts[prediction["label"]] = counts.get(prediction["label"], 0) + 1
+    mean_polarity = sum(polarity(p) for p in predictions) / len(predictions)
+    return {
+        "positive_count": counts["Positive"],
+        "negative_count": counts["Negative"],
+        "neutral_count": counts["Neutral"],
+        "local_score": round(50 + 50 * mean_polarity),
+    }
 
-        results.append({
+def build_response(texts, predictions, company_data):
+    results = [
+        {
             "text": text,
-            "label": label,
-            "confidence": confidence
-        })
+            "label": prediction["label"],
+            "confidence": prediction["confidence"]
+        }
+        for text, prediction in zip(texts, predictions)
+    ]
 
     return {
         "sentiments": results,
@@ -31,4 +49,3 @@ def analyze_sentiment(texts: list[str], company_data: dict) -> dict:
         },
         "company": company_data["companyName"]
     }
-
@@ -1,30 +1,22 @@
-import requests
+import asyncio
+import hashlib
 import json
+import os
 import re
+import httpx
 from config import GEMINI_API_KEY
+from services.cache import TTLCache
+from services.http_client import get_client
+from services.rate_limit import limiter
+from services.metrics import span, upstream_errors
+from services.resilience import breaker, http_timeout
+from analyzers.sentiment_cache import get_cache
 
-def extract_json(text):
-    """Extract JSON from markdown blocks"""
-    match = re.search(r'```(?:json)?\n(.*?)\n```', text, re.DOTALL)
-    return match.group(1).strip() if match else text
-
-def analyze_sentiment(texts, company_data):
-    """Analyze sentiment using Gemini API"""
-    if not texts:
-        return create_empty_response(company_data)
-    
-    # Prepare text content
-    content = "\n".join(texts) if isinstance(texts, list) else str(texts)
-    
-    # Build company context
-    context = f"""
-COMPANY: {company_data.get('companyName', 'N/A')}
-CEO: {company_data.get('ceo', 'N/A')}
-SECTOR: {company_data.get('sector', 'N/A')}
-COUNTRY: {company_data.get('country', 'N/A')}
-"""
+GEMINI_MODEL = "gemini-1.5-flash"
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+GENERATION_CONFIG = {"temperature": 0.3, "responseMimeType": "application/json"}
 
-    prompt = f"""
+PROMPT_TEMPLATE = """
 {context}
 
 Analyze sentiment for this company from the following content:
@@ -45,39 +37,161 @@ Return ONLY valid JSON with this exact structure:
   "brand_awareness_score": 0-100,
   "market_sentiment_score": 0-100,
   "public_opinion_score": 0-100,
-  "topic_scores": [{{"topic": "leadership", "score": 0-100}}, {{"topic": "innovation", "score": 0-100}}, {{"topic": "financials", "score": 0-100}}],
-  "trend_data": [{{"day": "Day 1", "sentiment": 70, "mentions": 15}}, {{"day": "Day 2", "sentiment": 65, "mentions": 12}}, {{"day": "Day 3", "sentiment": 75, "mentions": 18}}]
+  "topic_scores": [{{"topic": "leadership", "score": 0-100}}, {{"topic": "innovation", "score": 0-100}}, {{"topic": "financials", "score": 0-100}}]
 }}
 """
 
-    # API call
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={GEMINI_API_KEY}"
+# Successful Gemini results keyed by a hash of the prompt inputs, in memory and
+# in the "analysis" table shared with other workers; both honour the same TTL
+GEMINI_CACHE_TTL = float(os.getenv("GEMINI_CACHE_TTL", "1800"))
+result_cache = TTLCache(
+    maxsize=int(os.getenv("GEMINI_CACHE_SIZE", "256")),
+    ttl=GEMINI_CACHE_TTL,
+)
+
+# Upstream calls in flight, so identical concurrent requests share one call:
+# key -> [task, number of callers waiting on it]
+_inflight = {}
+
+def extract_json(text):
+    """Extract JSON from markdown blocks"""
+    match = re.search(r'```(?:json)?\n(.*?)\n```', text, re.DOTALL)
+    return match.group(1).strip() if match else text
+
+def estimate_tokens(text):
+    """Rough token count for prompt budgeting (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+async def analyze_sentiment(texts, company_data):
+    """Analyze sentiment using Gemini API"""
+    if not texts:
+        return create_empty_response(company_data)
     
-    payload = {
-        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-        "generationConfig": {"temperature": 0.3, "responseMimeType": "application/json"}
-    }
+    # Prepare text content
+    content = "\n".join(texts) if isinstance(texts, list) else str(texts)
+    
+    # Build company context
+    context = f"""
+COMPANY: {company_data.get('companyName', 'N/A')}
+CEO: {company_data.get('ceo', 'N/A')}
+SECTOR: {company_data.get('sector', 'N/A')}
+COUNTRY: {company_data.get('country', 'N/A')}
+"""
 
-    try:
-        response = requests.post(url, headers={"Content-Type": "application/json"}, json=payload)
-        response.raise_for_status()
-        
-        content = response.json()["candidates"][0]["content"]["parts"][0]["text"]
-        result = json.loads(extract_json(content))
-        
+    prompt = PROMPT_TEMPLATE.format(context=context, content=content)
+
+    key = result_key(texts, context)
+    result, state = result_cache.lookup(key)
+    if state is not None:
         return {
             "company_info": company_data,
             "analysis_result": result,
             "status": "success"
         }
-        
+
+    try:
+        result = await shared_call(key, prompt)
+        status = "success"
+        result_cache.set(key, result)
     except Exception as e:
         print(f"Analysis error: {e}")
-        return {
-            "company_info": company_data,
-            "analysis_result": {"error": str(e)},
-            "status": "error"
-        }
+        result, status = {"error": str(e)}, "error"
+
+    return {
+        "company_info": company_data,
+        "analysis_result": result,
+        "status": status
+    }
+
+async def shared_call(key, prompt):
+    """Join the in-flight call for ``key`` or start one.
+
+    The call is cancelled (closing its connection) once every caller waiting
+    on it has been cancelled, e.g. all their clients disconnected.
+    """
+    entry = _inflight.get(key)
+    if entry is None:
+        entry = _inflight[key] = [asyncio.ensure_future(fetch_result(key, prompt)), 0]
+        entry[0].add_done_callback(lambda _: _inflight.pop(key, None) if _inflight.get(key) is entry else None)
+    entry[1] += 1
+    try:
+        return await asyncio.shield(entry[0])
+    finally:
+        entry[1] -= 1
+        if not entry[1] and not entry[0].done():
+            entry[0].cancel()
+            if _inflight.get(key) is entry:
+                del _inflight[key]
+
+async def fetch_result(key, prompt):
+    """Gemini result from the analysis cache other workers share, else from the API"""
+    shared = get_cache("analysis", GEMINI_CACHE_TTL)
+    if shared is not None:
+        found = await asyncio.to_thread(shared.get_many, [key], GEMINI_MODEL)
+        if found:
+            return found[0]
+    result = await call_gemini(prompt)
+    if shared is not None:
+        await asyncio.to_thread(shared.put_many, [key], [result], GEMINI_MODEL)
+    return result
+
+async def analyze_items(items, company_data):
+    """Registry entry point: Gemini analysis of ranked {"text", ...} items"""
+    return await analyze_sentiment([item["text"] for item in items], company_data)
+
+def result_key(texts, context):
+    """Stable hash of everything that determines the Gemini output"""
+    texts = texts if isinstance(texts, list) else [str(texts)]
+    material = json.dumps({
+        "texts": sorted(texts),
+        "context": context,
+        "template": PROMPT_TEMPLATE,
+        "model": GEMINI_MODEL,
+        "generationConfig": GENERATION_CONFIG,
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+async def call_gemini(prompt):
+    """Send one prompt to Gemini and return the parsed JSON result.
+
+    Uses the shared async client, so cancelling the caller aborts the request.
+    Refused without a call while the Gemini circuit breaker is open.
+    """
+    url = f"{GEMINI_API_BASE}/v1beta/models/{GEMINI_MODEL}:generateContent"
+    
+    payload = {
+        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+        "generationConfig": GENERATION_CONFIG
+    }
+
+    circuit = breaker("gemini")
+    if not circuit.allow():
+        upstream_errors.inc(provider="gemini", status="circuit_open")
+        raise RuntimeError("Gemini circuit is open")
+    try:
+        async with limiter("gemini"):
+            with span("llm.gemini"):
+                try:
+                    response = await get_client().post(
+                        # Key in a header so it never shows up in error messages returned to clients
+                        url, json=payload, headers={"x-goog-api-key": GEMINI_API_KEY}, timeout=http_timeout("gemini")
+                    )
+                except httpx.TimeoutException:
+                    upstream_errors.inc(provider="gemini", status="timeout")
+                    raise
+        if response.status_code >= 400:
+            upstream_errors.inc(provider="gemini", status=str(response.status_code))
+        response.raise_for_status()
+    except asyncio.CancelledError:
+        circuit.release()
+        raise
+    except httpx.HTTPError:
+        circuit.record_failure()
+        raise
+    circuit.record_success()
+    
+    content = response.json()["candidates"][0]["content"]["parts"][0]["text"]
+    return json.loads(extract_json(content))
 
 def create_empty_response(company_data):
     """Create empty response when no data available"""
@@ -102,11 +216,7 @@ def create_empty_response(company_data):
                 {"topic": "innovation", "score": 50},
                 {"topic": "financials", "score": 50}
             ],
-            "trend_data": [
-                {"day": "Day 1", "sentiment": 50, "mentions": 0},
-                {"day": "Day 2", "sentiment": 50, "mentions": 0},
-                {"day": "Day 3", "sentiment": 50, "mentions": 0}
-            ]
+            "trend_data": []
         },
         "status": "no_data"
     }
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Analysis backends by mode name, imported on first use.
+
+Every backend exposes ``async analyze_items(items, company_data)`` taking the
+ranked {"text", "source", "timestamp", "relevance", ...} items and returning
+the /analyze response. Modules are only imported when their mode is first
+requested, so a worker never pays for backends it does not use (the OpenAI
+SDK, torch/transformers, ...).
+"""
+import importlib
+import threading
+
+# mode -> "module:function"
+BACKENDS = {
+    "llm": "analyzers.openrouter_sentiment:analyze_items",
+    "local": "analyzers.local_sentiment:analyze_items",
+    "hybrid": "analyzers.hybrid_sentiment:analyze_sentiment",
+    "chunked": "analyzers.chunked_sentiment:analyze_items",
+    "gpt": "analyzers.gpt_sentiment:analyze_items",
+    "deepseek": "analyzers.deepseek_sentiment:analyze_items",
+}
+
+_loaded = {}
+_lock = threading.Lock()
+
+def register(mode, target):
+    """Add or replace a backend; ``target`` is "module:function" or the coroutine function itself"""
+    with _lock:
+        BACKENDS[mode] = target
+        _loaded.pop(mode, None)
+
+def get_analyzer(mode):
+    """The analyze coroutine function for ``mode``, importing its module on first use"""
+    analyzer = _loaded.get(mode)
+    if analyzer is not None:
+        return analyzer
+    if mode not in BACKENDS:
+        raise ValueError(f"Unknown analysis mode: {mode}")
+    with _lock:
+        if mode not in _loaded:
+            target = BACKENDS[mode]
+            if isinstance(target, str):
+                module_name, function_name = target.split(":")
+                target = getattr(importlib.import_module(module_name), function_name)
+            _loaded[mode] = target
+            print(f"✅ Loaded analysis backend: {mode}")
+        return _loaded[mode]
+
+def loaded_modes():
+    return sorted(_loaded)
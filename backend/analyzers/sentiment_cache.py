@@ -0,0 +1,162 @@
+"""Per-text sentiment results shared by every analyzer and worker process.
+
+Results are keyed by (hash of the normalized text, analyzer/model id) in a
+SQLite file opened in WAL mode, so several uvicorn workers can read and
+write it concurrently. Entries older than ``max_age`` seconds are ignored
+and evicted, and the table is trimmed to ``max_rows`` least recently used
+rows. Each table (per-text "sentiment", whole-response "analysis") has its
+own age limit. Last-use times are written back in batches, not on every read.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+EVICT_EVERY = 500  # writes between eviction passes
+TOUCH_EVERY = 500  # cache hits between last-use write-backs
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def text_key(text):
+    normalized = " ".join(str(text).lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class SentimentCache:
+    def __init__(self, path, max_age=7 * 24 * 3600, max_rows=200_000, table="sentiment"):
+        self.path = path
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._touched = {}  # (key, model) -> last use, not yet written back
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connect().execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT NOT NULL, model TEXT NOT NULL, value TEXT NOT NULL,"
+            " created REAL NOT NULL, used REAL NOT NULL, PRIMARY KEY (key, model))"
+        )
+        self._connect().execute(f"CREATE INDEX IF NOT EXISTS {table}_used ON {table} (used)")
+
+    def _connect(self):
+        # sqlite3 connections are per thread; WAL lets processes share the file
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, texts, model):
+        """Cached values for ``texts`` as {index: value}; missing indexes are misses"""
+        keys = [text_key(text) for text in texts]
+        if not keys:
+            return {}
+        found = {}
+        connection = self._connect()
+        oldest = time.time() - self.max_age
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                f"SELECT key, value FROM {self.table} WHERE model = ? AND created >= ? AND key IN ({placeholders})",
+                [model, oldest, *chunk],
+            ).fetchall()
+            found.update(rows)
+        results = {i: json.loads(found[key]) for i, key in enumerate(keys) if key in found}
+        now = time.time()
+        with self._lock:
+            self.hits += len(results)
+            self.misses += len(keys) - len(results)
+            for key in found:
+                self._touched[(key, model)] = now
+            due = len(self._touched) >= TOUCH_EVERY
+        if due:
+            self.flush_touches()
+        return results
+
+    def flush_touches(self):
+        """Write the batched last-use times back for LRU trimming"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            self._connect().executemany(
+                f"UPDATE {self.table} SET used = ? WHERE key = ? AND model = ?",
+                [(used, key, model) for (key, model), used in touched.items()],
+            )
+
+    def put_many(self, texts, values, model):
+        now = time.time()
+        rows = [(text_key(text), model, json.dumps(value), now, now) for text, value in zip(texts, values)]
+        if not rows:
+            return
+        self._connect().executemany(
+            f"INSERT OR REPLACE INTO {self.table} (key, model, value, created, used) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        with self._lock:
+            self._writes += len(rows)
+            due = self._writes >= EVICT_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        self.flush_touches()
+        connection = self._connect()
+        connection.execute(f"DELETE FROM {self.table} WHERE created < ?", (time.time() - self.max_age,))
+        connection.execute(
+            f"DELETE FROM {self.table} WHERE rowid IN ("
+            f" SELECT rowid FROM {self.table} ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+def cached_scores(texts, model, score, table="sentiment", max_age=None):
+    """Score only the texts missing from the shared cache; results keep input order"""
+    cache = get_cache(table, max_age)
+    if cache is None:
+        return score(texts)
+    results = cache.get_many(texts, model)
+    missing = [i for i in range(len(texts)) if i not in results]
+    if missing:
+        fresh = score([texts[i] for i in missing])
+        cache.put_many([texts[i] for i in missing], fresh, model)
+        results.update(zip(missing, fresh))
+    return [results[i] for i in range(len(texts))]
+
+
+_caches = {}
+_cache_lock = threading.Lock()
+
+def get_cache(table="sentiment", max_age=None):
+    """Process-wide cache for ``table`` at SENTIMENT_CACHE_PATH, or None when that is set to ''.
+
+    A relative path is resolved against the backend directory, not the working
+    directory. ``max_age`` (seconds) applies when the table is first opened;
+    it defaults to SENTIMENT_CACHE_MAX_AGE.
+    """
+    path = os.getenv("SENTIMENT_CACHE_PATH", "sentiment_cache.db")
+    if not path:
+        return None
+    with _cache_lock:
+        if table not in _caches:
+            _caches[table] = SentimentCache(
+                os.path.join(BACKEND_DIR, path),
+                max_age=max_age if max_age is not None else float(os.getenv("SENTIMENT_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+                max_rows=int(os.getenv("SENTIMENT_CACHE_MAX_ROWS", "200000")),
+                table=table,
+            )
+    return _caches[table]
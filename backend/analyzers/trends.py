@@ -0,0 +1,61 @@
+"""Sentiment over time: per-text scores bucketed by publish time with NumPy.
+
+Timestamps are parsed once, then every point is bucketed and aggregated in
+one vectorized pass, so thousands of articles and tweets per company cost a
+few milliseconds.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+WINDOWS = {"hour": 3600, "day": 24 * 3600, "week": 7 * 24 * 3600}
+LABEL_UNITS = {"hour": "m", "day": "D", "week": "D"}
+# 1970-01-01 was a Thursday; shift weekly buckets so they start on Monday
+WEEK_OFFSET = 3 * 24 * 3600
+
+def to_epoch(timestamps):
+    """Seconds since the epoch for ISO timestamps; NaN where missing or unparseable.
+
+    Offsets ("Z", "+05:30") are honoured; timestamps without one are taken as UTC.
+    """
+    return np.array([_parse_one(value) for value in timestamps], dtype=float)
+
+def _parse_one(value):
+    if not value:
+        return np.nan
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return np.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def bucket_trend(timestamps, sentiments, mentions=None, window="day"):
+    """Mention-weighted mean sentiment (0-100) and mention count per time bucket.
+
+    Returns [{"day": <bucket start>, "sentiment", "mentions"}] oldest first,
+    with only the buckets that have at least one timestamped text.
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown trend window: {window}")
+    seconds = to_epoch(timestamps)
+    sentiments = np.asarray(sentiments, dtype=float)
+    weights = np.ones(len(seconds)) if mentions is None else np.asarray(mentions, dtype=float)
+
+    known = ~np.isnan(seconds)
+    if not known.any():
+        return []
+
+    width = WINDOWS[window]
+    offset = WEEK_OFFSET if window == "week" else 0
+    buckets = ((seconds[known] + offset) // width).astype(np.int64)
+    starts, inverse = np.unique(buckets, return_inverse=True)
+    counts = np.bincount(inverse, weights=weights[known])
+    means = np.bincount(inverse, weights=sentiments[known] * weights[known]) / counts
+
+    labels = np.datetime_as_string((starts * width - offset).astype("datetime64[s]"), unit=LABEL_UNITS[window])
+    return [
+        {"day": str(label).replace("T", " "), "sentiment": int(round(mean)), "mentions": int(count)}
+        for label, mean, count in zip(labels, means, counts)
+    ]
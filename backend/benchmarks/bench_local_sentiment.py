@@ -0,0 +1,56 @@
+"""Throughput of the local sentiment engine at different batch sizes.
+
+Run from backend/:
+    python -m benchmarks.bench_local_sentiment --texts 256 --batch-sizes 1,8,16,32,64 --variant quantized
+"""
+import argparse
+import os
+import random
+import time
+
+from analyzers.local_engine import LocalSentimentEngine, MODEL_NAME
+
+SAMPLE_SENTENCES = [
+    "Acme Corp shares jumped after a strong quarterly earnings report.",
+    "Customers complain that the new app update keeps crashing.",
+    "The CEO announced a partnership with a major cloud provider.",
+    "Regulators opened an investigation into the company's accounting.",
+    "Analysts remain neutral on the stock ahead of the product launch.",
+    "Employees praised the leadership team for transparent communication during the restructuring.",
+]
+
+def make_texts(count, seed=0):
+    rng = random.Random(seed)
+    # Mix of short tweets and long article snippets, like a real /analyze corpus
+    return [" ".join(rng.choices(SAMPLE_SENTENCES, k=rng.randint(1, 6))) for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", default="1,8,16,32,64")
+    parser.add_argument("--variant", default="default", choices=["default", "quantized", "onnx"])
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument("--model", default=MODEL_NAME)
+    args = parser.parse_args()
+
+    # Measure the model itself, not the shared sentiment cache
+    os.environ["SENTIMENT_CACHE_PATH"] = ""
+
+    texts = make_texts(args.texts)
+    engine = LocalSentimentEngine(args.model, max_length=args.max_length, variant=args.variant)
+
+    started = time.perf_counter()
+    engine.load()
+    print(f"model load: {time.perf_counter() - started:.2f}s ({args.variant})")
+    engine.predict(texts[:8])  # warm-up
+
+    print(f"{'batch':>6} {'seconds':>9} {'texts/sec':>10}")
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        engine.batch_size = batch_size
+        started = time.perf_counter()
+        engine.predict(texts)
+        elapsed = time.perf_counter() - started
+        print(f"{batch_size:>6} {elapsed:>9.2f} {len(texts) / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Relevance scoring: compiled matcher vs the original per-keyword substring scans.
+
+"new texts" builds a fresh matcher every run, so nothing comes from its memo;
+"rescored" scores the same batch again, as /analyze does with cached fetches.
+
+Run from backend/:
+    python -m benchmarks.bench_relevance --texts 2000 --repeat 20
+"""
+import argparse
+import random
+import time
+
+from services.relevance import SECTOR_KEYWORDS, RelevanceMatcher
+
+COMPANY = {"companyName": "Acme Corp", "ceo": "Jane Doe", "sector": "technology", "ticker": "ACME"}
+
+def legacy_score(text, company_data):
+    """Scoring as filter_relevant_content did it before the compiled matcher"""
+    sector_map = {
+        "technology": ["tech", "software", "ai", "digital", "innovation"],
+        "aviation": ["airline", "flight", "aircraft", "airport", "aviation"],
+        "finance": ["bank", "financial", "money", "investment", "credit"],
+        "healthcare": ["health", "medical", "hospital", "pharma", "medicine"],
+        "retail": ["store", "shopping", "customer", "sales", "retail"],
+        "energy": ["energy", "oil", "gas", "renewable", "power"],
+        "automotive": ["car", "vehicle", "auto", "transport", "mobility"]
+    }
+    text_lower = text.lower()
+    score = 0
+    if company_data["companyName"].lower() in text_lower:
+        score += 10
+    if company_data["ceo"] and company_data["ceo"].lower() in text_lower:
+        score += 8
+    for keyword in sector_map.get(company_data["sector"].lower(), []):
+        if keyword in text_lower:
+            score += 3
+            break
+    if len(text) > 100:
+        score += 2
+    return score
+
+def make_texts(count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = ("market shares said growth quarter customers revenue product launch "
+                  "investors report analysts expected cloud platform team").split()
+    vocabulary += ["Acme Corp", "Jane Doe", "ACME", "Doe"] + SECTOR_KEYWORDS["technology"]
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(8, 60))) for _ in range(count)]
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    profile = (COMPANY["companyName"], COMPANY["ceo"], COMPANY["sector"], COMPANY["ticker"])
+    matcher = RelevanceMatcher(*profile)
+    matcher.score_batch(texts)
+
+    results = {
+        "legacy substring scans": timed(lambda: [legacy_score(t, COMPANY) for t in texts], args.repeat),
+        "score_batch, new texts": timed(lambda: RelevanceMatcher(*profile).score_batch(texts), args.repeat),
+        "score_batch, rescored": timed(lambda: matcher.score_batch(texts), args.repeat),
+    }
+    for name, seconds in results.items():
+        print(f"{name:<24} {seconds * 1000:>8.2f} ms  {len(texts) / seconds:>10.0f} texts/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Worker cold start: import time of the API module and of each analysis backend.
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+Run from backend/:
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from analyzers.registry import BACKENDS
+
+HEAVY_MODULES = ["openai", "torch", "transformers", "requests", "pymongo.mongo_client"]
+
+IMPORT_MAIN = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": [m for m in %r if m in sys.modules]}))
+"""
+
+LOAD_BACKEND = """
+import json, time
+import main
+from analyzers.registry import get_analyzer
+started = time.perf_counter()
+try:
+    get_analyzer(%r)
+    error = None
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+print(json.dumps({"seconds": time.perf_counter() - started, "error": error}))
+"""
+
+def run(code):
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    # Backends print a line when they load; the measurement is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run(IMPORT_MAIN % HEAVY_MODULES) for _ in range(args.runs)]
+    seconds = statistics.median(sample["seconds"] for sample in samples)
+    print(f"import main: {seconds * 1000:.0f} ms median of {args.runs}")
+    print(f"heavy modules loaded at import: {', '.join(samples[0]['modules']) or 'none'}")
+
+    print(f"{'backend':>10} {'first use (ms)':>15}")
+    for mode in BACKENDS:
+        sample = run(LOAD_BACKEND % mode)
+        result = f"{sample['seconds'] * 1000:>15.0f}" if sample["error"] is None else f"{'failed':>15}  {sample['error']}"
+        print(f"{mode:>10} {result}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Local stand-ins for NewsAPI, GNews, Twitter recent search and Gemini.
+
+Responses have the same shape as the real APIs. Texts mention the queried
+company so they pass relevance filtering. Latency, error rate and payload
+size come from environment variables:
+
+    FAKE_LATENCY_MS    mean added latency per call (default 100)
+    FAKE_JITTER_MS     uniform +/- jitter around the mean (default 50)
+    FAKE_ERROR_RATE    fraction of calls answered with a 5xx/429 (default 0)
+    FAKE_ARTICLES      articles or tweets per search response (default 20)
+
+Run from backend/:
+    uvicorn benchmarks.fake_providers:app --port 8200
+
+then point the API at it (benchmarks/load_test.py does this for you):
+    NEWSAPI_URL=http://127.0.0.1:8200/newsapi/v2/everything
+    GNEWS_URL=http://127.0.0.1:8200/gnews/api/v4/search
+    TWITTER_SEARCH_URL=http://127.0.0.1:8200/twitter/2/tweets/search/recent
+    GEMINI_API_BASE=http://127.0.0.1:8200/gemini
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("FAKE_LATENCY_MS", "100"))
+JITTER_MS = float(os.getenv("FAKE_JITTER_MS", "50"))
+ERROR_RATE = float(os.getenv("FAKE_ERROR_RATE", "0"))
+ARTICLES = int(os.getenv("FAKE_ARTICLES", "20"))
+
+HEADLINES = [
+    "{q} raises new funding round led by global investors",
+    "{q} reports strong quarterly revenue growth",
+    "Customers complain about {q} app outages this week",
+    "{q} CEO announces partnership with a major cloud provider",
+    "Regulators open an inquiry into {q} accounting practices",
+    "{q} launches AI product to mixed reviews from analysts",
+    "{q} cuts jobs as it restructures its sales team",
+    "Analysts stay neutral on {q} ahead of the product launch",
+]
+DETAILS = [
+    "The company said the technology platform will expand into new markets next year.",
+    "Shares moved sharply as investors weighed the outlook for the software business.",
+    "Employees described the leadership team as transparent during the transition.",
+    "The startup's innovation roadmap focuses on automation and data infrastructure.",
+]
+
+app = FastAPI()
+
+def rng_for(*parts):
+    # Same query -> same payload, like a real search index within a short window
+    seed = hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=8).hexdigest()
+    return random.Random(int(seed, 16))
+
+async def simulate():
+    """Sleep for the configured latency; return an error response for a share of calls"""
+    delay = max(0.0, LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS)) / 1000
+    await asyncio.sleep(delay)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        status = random.choice([429, 500, 503])
+        return JSONResponse({"status": "error", "message": "simulated failure"}, status_code=status)
+    return None
+
+def timestamps(rng, count):
+    now = datetime.now(timezone.utc)
+    return [
+        (now - timedelta(minutes=rng.randint(0, 6 * 24 * 60))).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for _ in range(count)
+    ]
+
+def articles(provider, query, count):
+    rng = rng_for(provider, query)
+    items = []
+    for i, published in enumerate(timestamps(rng, count)):
+        title = rng.choice(HEADLINES).format(q=query)
+        items.append({
+            "title": title,
+            "description": f"{title}. {rng.choice(DETAILS)}",
+            "content": " ".join(rng.choices(DETAILS, k=3)),
+            "url": f"https://{provider}.example/{hashlib.md5(f'{query}{i}'.encode()).hexdigest()}",
+            "publishedAt": published,
+            "source": {"name": f"{provider} wire"},
+        })
+    return items
+
+@app.get("/newsapi/v2/everything")
+async def newsapi(q: str = "", pageSize: int = ARTICLES):
+    error = await simulate()
+    if error:
+        return error
+    results = articles("newsapi", q, min(pageSize, ARTICLES))
+    return {"status": "ok", "totalResults": len(results), "articles": results}
+
+@app.get("/gnews/api/v4/search")
+async def gnews(q: str = "", max: int = ARTICLES):
+    error = await simulate()
+    if error:
+        return error
+    results = articles("gnews", q, min(max, ARTICLES))
+    return {"totalArticles": len(results), "articles": results}
+
+@app.get("/twitter/2/tweets/search/recent")
+async def twitter(query: str = "", max_results: int = 10):
+    error = await simulate()
+    if error:
+        return error
+    rng = rng_for("twitter", query)
+    count = min(max_results, ARTICLES)
+    tweets = []
+    for published in timestamps(rng, count):
+        tweet_id = str(rng.randint(10**18, 10**19))
+        tweets.append({
+            "id": tweet_id,
+            "text": rng.choice(HEADLINES).format(q=query) + " " + rng.choice(["#startup", "#tech", "🚀", "👎"]),
+            "created_at": published,
+            "edit_history_tweet_ids": [tweet_id],
+        })
+    return {"data": tweets, "meta": {"result_count": len(tweets)}}
+
+@app.post("/gemini/v1beta/models/{model}:generateContent")
+async def gemini(model: str, request: Request):
+    error = await simulate()
+    if error:
+        return error
+    body = await request.json()
+    prompt = body["contents"][0]["parts"][0]["text"]
+    rng = rng_for("gemini", prompt)
+    score = rng.randint(20, 90)
+    result = {
+        "score": score,
+        "sentiment": "positive" if score >= 60 else "negative" if score <= 40 else "neutral",
+        "confidence_level": rng.choice(["low", "medium", "high"]),
+        "positive_count": rng.randint(0, 10),
+        "negative_count": rng.randint(0, 10),
+        "neutral_count": rng.randint(0, 10),
+        "most_positive": "Strong quarterly revenue growth",
+        "most_negative": "Customers complain about app outages",
+        "key_insights": ["Funding momentum", "Product reliability concerns", "Leadership seen as transparent"],
+        "recommendations": ["Improve uptime", "Publicize partnerships", "Engage analysts"],
+        "brand_awareness_score": rng.randint(20, 90),
+        "market_sentiment_score": rng.randint(20, 90),
+        "public_opinion_score": rng.randint(20, 90),
+        "topic_scores": [{"topic": topic, "score": rng.randint(20, 90)} for topic in ("leadership", "innovation", "financials")],
+    }
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": json.dumps(result)}]}}]}
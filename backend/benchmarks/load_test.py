@@ -0,0 +1,256 @@
+"""Offline load test of /analyze and /search-investment-opportunities.
+
+Starts benchmarks.fake_providers and the API (with MONGO_BACKEND=mongomock
+and placeholder keys) as local processes, so no network access or real keys
+are needed. It drives both endpoints at the given concurrency and reports
+p50/p95/p99 latency, throughput and per-stage means from /metrics. Every run
+is saved as JSON. Pass --baseline with an earlier result file to fail
+(exit 1) on regressions. Needs mongomock (pip install mongomock).
+
+Run from backend/:
+    python -m benchmarks.load_test --requests 200 --concurrency 16 --latency-ms 100 --error-rate 0.02
+    python -m benchmarks.load_test --baseline benchmarks/results/load-20250101-120000.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+PLACEHOLDER_CONFIG = """MONGO_KEY = "mongodb://127.0.0.1:1"
+NEWSAPI_KEY = GNEWS_API_KEY = BEARER_TOKEN = "offline"
+GEMINI_API_KEY = OPENAI_API_KEY = OPENROUTER_API_KEY = "offline"
+"""
+
+SECTORS = ["Technology", "Healthcare", "Finance", "Education", "Retail"]
+FUNDING = ["Less than 1 Cr", "1 - 5 Cr", "5 - 10 Cr", "10 - 50 Cr"]
+EMPLOYEES = ["1 - 10", "10 - 50", "50 - 200", "200+"]
+COUNTRIES = ["India", "USA", "UK", "Germany"]
+
+def start(command, env, log_path):
+    log = open(log_path, "w")
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+def wait_ready(url, process, log_path, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up; see {log_path}")
+
+def server_env(args, config_dir):
+    fake = f"http://127.0.0.1:{args.fake_port}"
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join([config_dir, BACKEND_DIR]),
+        "FAKE_LATENCY_MS": str(args.latency_ms),
+        "FAKE_JITTER_MS": str(args.jitter_ms),
+        "FAKE_ERROR_RATE": str(args.error_rate),
+        "FAKE_ARTICLES": str(args.articles),
+        "NEWSAPI_URL": f"{fake}/newsapi/v2/everything",
+        "GNEWS_URL": f"{fake}/gnews/api/v4/search",
+        "TWITTER_SEARCH_URL": f"{fake}/twitter/2/tweets/search/recent",
+        "GEMINI_API_BASE": f"{fake}/gemini",
+        "MONGO_BACKEND": "mongomock",
+        "ANALYSIS_MODE": args.mode,
+        "SENTIMENT_CACHE_PATH": "",
+        "TREND_LOCAL_SCORES": "1" if args.mode in ("local", "hybrid") else "0",
+    })
+    if not args.keep_rate_limits:
+        # Measure the pipeline, not the free-tier quotas
+        for provider in ("gnews", "newsapi", "twitter", "gemini"):
+            env[f"{provider.upper()}_RATE_PER_SEC"] = "10000"
+            env[f"{provider.upper()}_RATE_BURST"] = "10000"
+            env[f"{provider.upper()}_RATE_CONCURRENCY"] = "256"
+    return env
+
+def analyze_payload(i, args):
+    rng = random.Random(i % args.companies)
+    return {
+        "companyName": f"Benchco {i % args.companies}",
+        "ceo": f"Alex Bench{i % args.companies}",
+        "sector": rng.choice(SECTORS),
+        "fundingRange": rng.choice(FUNDING),
+        "employees": rng.choice(EMPLOYEES),
+        "country": rng.choice(COUNTRIES),
+        "isStartup": True,
+        "analysisMode": args.mode,
+    }
+
+def search_payload(i, args):
+    rng = random.Random(i)
+    body = {"sector": rng.choice(SECTORS)}
+    if rng.random() < 0.5:
+        body["fundingRange"] = rng.choice(FUNDING)
+    if rng.random() < 0.3:
+        body["country"] = rng.choice(COUNTRIES)
+    return body
+
+async def drive(client, path, payloads, concurrency):
+    """POST every payload with at most ``concurrency`` in flight; returns (latencies, errors, seconds)"""
+    latencies, errors = [], 0
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(payload):
+        nonlocal errors
+        async with slots:
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                failed = response.status_code != 200 or "error" in response.json()
+            except (httpx.HTTPError, ValueError):
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(payload) for payload in payloads))
+    return latencies, errors, time.perf_counter() - started
+
+def summarize(latencies, errors, seconds):
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(latencies) / seconds, 2),
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "p99_ms": round(float(p99), 1),
+    }
+
+def stage_means(metrics_text):
+    """Mean milliseconds per pipeline stage from the API's /metrics output"""
+    sums, counts = {}, {}
+    for name, stage, value in re.findall(r'^stage_duration_seconds_(sum|count)\{stage="([^"]+)"\} (\S+)$', metrics_text, re.M):
+        (sums if name == "sum" else counts)[stage] = float(value)
+    return {stage: round(sums[stage] / counts[stage] * 1000, 2) for stage in sorted(sums) if counts.get(stage)}
+
+def compare(result, baseline, tolerance):
+    """Human-readable regressions of ``result`` against ``baseline``"""
+    regressions = []
+    for endpoint, summary in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint)
+        if not before:
+            continue
+        for field in ("p50_ms", "p95_ms", "p99_ms"):
+            if summary[field] > before[field] * (1 + tolerance):
+                regressions.append(f"{endpoint} {field}: {before[field]} -> {summary[field]}")
+        if summary["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint} throughput_rps: {before['throughput_rps']} -> {summary['throughput_rps']}")
+    for stage, mean in result["stages_ms"].items():
+        before = baseline.get("stages_ms", {}).get(stage)
+        # Ignore sub-millisecond stages; their noise dwarfs any regression
+        if before and mean > 1 and mean > before * (1 + tolerance):
+            regressions.append(f"stage {stage}: {before} -> {mean} ms")
+    return regressions
+
+async def run(args):
+    base = f"http://127.0.0.1:{args.api_port}"
+    async with httpx.AsyncClient(base_url=base, timeout=120, limits=httpx.Limits(max_connections=args.concurrency)) as client:
+        endpoints = {}
+        if "analyze" in args.endpoints:
+            payloads = [analyze_payload(i, args) for i in range(args.requests)]
+            endpoints["/analyze"] = summarize(*await drive(client, "/analyze", payloads, args.concurrency))
+        if "search" in args.endpoints:
+            payloads = [search_payload(i, args) for i in range(args.requests)]
+            endpoints["/search-investment-opportunities"] = summarize(
+                *await drive(client, "/search-investment-opportunities", payloads, args.concurrency)
+            )
+        metrics = (await client.get("/metrics")).text
+    return endpoints, stage_means(metrics)
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--companies", type=int, default=50, help="distinct companies; fewer means more cache hits")
+    parser.add_argument("--mode", default="llm", help="analysisMode sent to /analyze")
+    parser.add_argument("--endpoints", default="analyze,search")
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--articles", type=int, default=20, help="items per provider response")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="keep the providers' free-tier rate limits")
+    parser.add_argument("--fake-port", type=int, default=8200)
+    parser.add_argument("--api-port", type=int, default=8300)
+    parser.add_argument("--output", help="result file (default benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        with open(os.path.join(config_dir, "config.py"), "w") as f:
+            f.write(PLACEHOLDER_CONFIG)
+        env = server_env(args, config_dir)
+        fake_log, api_log = os.path.join(config_dir, "fake.log"), os.path.join(config_dir, "api.log")
+        uvicorn = [sys.executable, "-m", "uvicorn", "--log-level", "warning"]
+        fake = start(uvicorn + ["benchmarks.fake_providers:app", "--port", str(args.fake_port)], env, fake_log)
+        api = start(uvicorn + ["main:app", "--port", str(args.api_port)], env, api_log)
+        try:
+            wait_ready(f"http://127.0.0.1:{args.fake_port}/docs", fake, fake_log)
+            wait_ready(f"http://127.0.0.1:{args.api_port}/", api, api_log)
+            endpoints, stages = asyncio.run(run(args))
+        finally:
+            for process in (api, fake):
+                process.terminate()
+                process.wait(timeout=10)
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "endpoints": endpoints,
+        "stages_ms": stages,
+    }
+
+    print(f"{'endpoint':<34} {'reqs':>5} {'errs':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, s in endpoints.items():
+        print(f"{endpoint:<34} {s['requests']:>5} {s['errors']:>5} {s['throughput_rps']:>8} "
+              f"{s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+    print("stage means (ms): " + ", ".join(f"{stage}={mean}" for stage, mean in stages.items()))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"saved {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != result["params"]:
+            print("⚠️ baseline was recorded with different parameters; the comparison may not be meaningful")
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+if __name__ == "__main__":
+    main()
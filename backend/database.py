@@ -1,6 +1,74 @@
-from pymongo import MongoClient
+import os
+import threading
+
+from pymongo import ASCENDING, DESCENDING, MongoClient, monitoring
 from config import MONGO_KEY
+from services.metrics import record
+
+class CommandTimer(monitoring.CommandListener):
+    """Feeds every Mongo round-trip (find, getMore, update, ...) into the stage metrics"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record(f"db.{event.command_name}", event.duration_micros / 1e6)
+
+    def failed(self, event):
+        record(f"db.{event.command_name}", event.duration_micros / 1e6)
+
+# "mongomock" swaps in an in-memory database for benchmarks (pip install mongomock)
+MONGO_BACKEND = os.getenv("MONGO_BACKEND", "")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Shared MongoClient, opened on first use rather than at import"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if MONGO_BACKEND == "mongomock":
+                import mongomock
+                import mongomock.gridfs
+                mongomock.gridfs.enable_gridfs_integration()
+                _client = mongomock.MongoClient()
+            else:
+                _client = MongoClient(MONGO_KEY, event_listeners=[CommandTimer()])
+    return _client
+
+def get_db():
+    return get_client().company_data
+
+class LazyCollection:
+    """Collection handle that resolves to ``get_db()[name]`` on each use"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attribute):
+        return getattr(get_db()[self.name], attribute)
+
+company_collection = LazyCollection("companies")
+article_collection = LazyCollection("articles")
+
+# Compound indexes for /search-investment-opportunities; each ends in _id, so a
+# query whose equality filters are exactly one index's leading fields gets its
+# keyset pagination on _id straight from the index. Other filter combinations
+# still narrow through an index but sort the (page-size bounded) matches in memory.
+SEARCH_INDEXES = [
+    [("sector", ASCENDING), ("_id", ASCENDING)],
+    [("sector", ASCENDING), ("funding_range", ASCENDING), ("_id", ASCENDING)],
+    [("sector", ASCENDING), ("funding_range", ASCENDING), ("employees", ASCENDING), ("country", ASCENDING), ("_id", ASCENDING)],
+    [("sector", ASCENDING), ("country", ASCENDING), ("_id", ASCENDING)],
+    [("funding_range", ASCENDING), ("_id", ASCENDING)],
+    [("employees", ASCENDING), ("_id", ASCENDING)],
+    [("country", ASCENDING), ("_id", ASCENDING)],
+]
 
-client = MongoClient(MONGO_KEY)
-db = client.company_data
-company_collection = db.companies
+def ensure_indexes():
+    """Create the indexes the API relies on; safe to call on every startup"""
+    company_collection.create_index([("companyName", ASCENDING)])
+    for keys in SEARCH_INDEXES:
+        company_collection.create_index(keys)
+    article_collection.create_index([("company", ASCENDING), ("source", ASCENDING), ("published_at", DESCENDING)])
@@ -1,12 +1,138 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Form, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from services.twitter_service import fetch_tweets
-from services.news_service import fetch_gnews_data, fetch_newsapi_data
-from analyzers.openrouter_sentiment import analyze_sentiment
-from database import company_collection
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from bson import ObjectId
+from bson.errors import InvalidId
+from bson import json_util
+from services.twitter_service import fetch_tweets_async
+from services.news_service import fetch_gnews_data_async, fetch_newsapi_data_async
+from services.http_client import close_client
+from services.cache import fetch_cache, normalize_query
+from services.dedup import NearDuplicateIndex
+from services.relevance import matcher_for
+from services.matching import match_index
+from services.scheduler import RefreshScheduler
+from services import article_store, deck_store
+from services.rate_limit import background
+from services.resilience import breaker, hedge_after, hedged, within_deadline
+from services.metrics import CallbackCounter, TimingMiddleware, render as render_metrics, span, texts_total, upstream_errors
+from analyzers.registry import BACKENDS, get_analyzer, loaded_modes
+from analyzers.local_sentiment import local_summary, polarity
+from analyzers.trends import WINDOWS as TREND_WINDOWS, bucket_trend
+from analyzers.batch_server import classify, model_ready
+from analyzers.sentiment_cache import get_cache as get_sentiment_cache
+from database import company_collection, ensure_indexes
 import asyncio
+import heapq
+import httpx
+import json
+import os
+import sys
+import time
+import uuid
+from urllib.parse import quote
 
-app = FastAPI()
+# "llm" sends texts to Gemini, "local" scores them with the shared local model,
+# "hybrid" scores everything locally and sends only a selection to Gemini,
+# "chunked" splits a larger text set into token-budgeted Gemini calls run in parallel,
+# "gpt" and "deepseek" use those APIs (see analyzers/registry.py)
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "llm")
+HYBRID_MAX_TEXTS = int(os.getenv("HYBRID_MAX_TEXTS", "500"))
+CHUNKED_MAX_TEXTS = int(os.getenv("CHUNKED_MAX_TEXTS", "300"))
+
+# trend_data bucket size ("hour", "day" or "week"; per-request "trendWindow").
+# Local and hybrid modes always bucket per-text local model scores, reusing the
+# predictions their analyzer just cached. TREND_LOCAL_SCORES opts the other
+# modes in; those scores are computed next to the analyzer call and only when
+# the local model is already loaded, so it never pulls torch into an "llm" request.
+TREND_WINDOW = os.getenv("TREND_WINDOW", "day")
+TREND_LOCAL_SCORES = os.getenv("TREND_LOCAL_SCORES", "0") == "1"
+LOCAL_MODEL_MODES = {"local", "hybrid"}
+
+# SimHash similarity at or above which two texts count as the same story
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.9"))
+RELEVANCE_MIN_SCORE = 5
+
+# Overall /analyze budget (seconds): fetches are cut to fit it, and an analysis
+# still running when it runs out is abandoned with a "timeout" response
+ANALYZE_BUDGET = float(os.getenv("ANALYZE_BUDGET", "30"))
+
+# Per-provider deadlines (seconds) for the concurrent fetch fan-out, including
+# rate-limit waits; connect/read deadlines per attempt live in services/resilience.py
+PROVIDER_TIMEOUTS = {
+    "gnews": 6.0,
+    "newsapi": 6.0,
+    "twitter": 5.0,
+}
+
+# Batch analysis: companies analyzed at once, and a looser fetch deadline
+# because batch fetches queue behind the provider rate limits
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_FETCH_TIMEOUT = float(os.getenv("BATCH_FETCH_TIMEOUT", "300"))
+# Finished "job" mode results are kept for BATCH_JOB_TTL seconds, and at most
+# BATCH_MAX_JOBS jobs (running or finished) are held at once
+BATCH_JOB_TTL = float(os.getenv("BATCH_JOB_TTL", "3600"))
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "100"))
+BATCH_JOBS = {}
+_batch_finished = {}  # job id -> time.monotonic() when it finished, oldest first
+_batch_tasks = set()
+_store_tasks = set()  # article store writes after /analyze (see store_analyzed_texts)
+
+# Seconds between background refreshes of stored startups; 0 disables them
+REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", "0"))
+
+# Add a Server-Timing header (per-stage latencies) to every response
+TIMING_HEADERS = os.getenv("TIMING_HEADERS", "0") == "1"
+
+# Room for multipart boundaries and part headers on top of the deck size limit
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Fields returned by the investor search list view; pitchDeck is the short text
+# summary shown on each card (uploaded deck files live in GridFS)
+LIST_FIELDS = ["companyName", "ceo", "country", "sector", "employees", "funding_range",
+               "revenue", "year", "email", "links", "ticker", "isPublic", "pitchDeck"]
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+@asynccontextmanager
+async def lifespan(app):
+    try:
+        await asyncio.to_thread(ensure_indexes)
+    except Exception as e:
+        print(f"DB error: {e}")
+    # Keep references: the event loop only holds weak ones to running tasks
+    startup_tasks = [asyncio.create_task(load_match_index()), asyncio.create_task(preload_analyzer())]
+    refresh_scheduler.start()
+    yield
+    for task in startup_tasks + list(_batch_tasks) + list(_store_tasks):
+        task.cancel()
+    await refresh_scheduler.stop()
+    await close_client()
+
+async def load_match_index():
+    """Fill the in-memory matching index from Mongo without delaying startup"""
+    try:
+        await asyncio.to_thread(
+            lambda: match_index.load(company_collection.find({"isStartup": True}))
+        )
+        print(f"✅ Match index loaded: {len(match_index)} startups")
+    except Exception as e:
+        print(f"DB error: {e}")
+
+async def preload_analyzer():
+    """Import the default analysis backend in the background; other modes load on first use"""
+    try:
+        await asyncio.to_thread(get_analyzer, ANALYSIS_MODE)
+    except Exception as e:
+        print(f"❌ Analysis backend {ANALYSIS_MODE} failed to load: {e}")
+
+refresh_scheduler = RefreshScheduler(REFRESH_INTERVAL, lambda: list_startups(), lambda company: background(refresh_startup(company)))
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(TimingMiddleware, timing_headers=TIMING_HEADERS)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,37 +146,14 @@ app.add_middleware(
 async def analyze_company(request: Request):
     try:
         data = await request.json()
-        
-        # Extract company data
-        company_data = {
-            "companyName": data.get("companyName", "").strip(),
-            "ceo": data.get("ceo", "").strip(),
-            "country": data.get("country", "").strip(),  
-            "sector": data.get("sector", "").strip(),
-            "revenue": data.get("revenue", ""),
-            "employees": data.get("employees", ""),
-            "year": data.get("year", ""),
-            "ticker": data.get("ticker", ""),
-            "links": data.get("links", ""),
-            "funding_range": data.get("fundingRange", "").strip(),
-            "isPublic": data.get("isPublic", False),
-            "isStartup": data.get("isStartup", False),
-            "email": data.get("contactInfo", ""),
-            "pitchDeck": data.get("pitchDeck", "")
-        }
+        company_data = parse_company_data(data)
         
         if not company_data["companyName"]:
             raise HTTPException(status_code=400, detail="Company name is required")
+        mode, trend_window = analysis_options(data)
 
-        # Store startup data
-        if company_data["isStartup"]:
-            try:
-                existing = company_collection.find_one({"companyName": company_data["companyName"]})
-                if not existing:
-                    company_collection.insert_one(company_data)
-                    print(f"✅ Stored startup: {company_data['companyName']}")
-            except Exception as e:
-                print(f"DB error: {e}")
+        deadline = asyncio.get_running_loop().time() + ANALYZE_BUDGET
+        await store_startup(company_data)
 
         #uncomment to add to database
         #return "success"
@@ -59,63 +162,26 @@ async def analyze_company(request: Request):
         combined_texts = []
         
         try:
-            # Create search queries
-            company_query = company_data["companyName"]
-            ceo_query = company_data["ceo"] if company_data["ceo"] else None
-            
-            # Fetch news data
-            print(f"📰 Fetching news for: {company_query}")
-            gnews_company = fetch_gnews_data(company_query).get("results", [])
-            newsapi_company = fetch_newsapi_data(company_query).get("results", [])
-            
-            # Fetch CEO news if available
-            gnews_ceo = []
-            newsapi_ceo = []
-            if ceo_query:
-                print(f"👔 Fetching CEO news for: {ceo_query}")
-                gnews_ceo = fetch_gnews_data(ceo_query).get("results", [])
-                newsapi_ceo = fetch_newsapi_data(ceo_query).get("results", [])
-            
-            # Fetch Twitter data
-            print(f"🐦 Fetching tweets for: {company_query}")
-            tweets = fetch_tweets(company_query, max_results=10)
-            
-            # Process news articles
-            all_news = gnews_company + newsapi_company + gnews_ceo + newsapi_ceo
-            for article in all_news:
-                title = article.get("title", "")
-                description = article.get("description", "")
-                content = article.get("content", "")
-                
-                # Combine title and description/content
-                text = f"{title}. {description or content}".strip()
-                if text and len(text) > 20:  # Filter out very short texts
-                    combined_texts.append({
-                        "text": text,
-                        "source": "news",
-                        "timestamp": article.get("publishedAt") or article.get("published_at")
-                    })
-            
-            # Process tweets
-            for tweet in tweets:
-                tweet_text = tweet.get("text", "")
-                if tweet_text and not tweet_text.startswith("RT @"):  # Skip retweets
-                    combined_texts.append({
-                        "text": tweet_text,
-                        "source": "twitter",
-                        "timestamp": tweet.get("created_at")
-                    })
-                        
+            print(f"📰 Fetching news and tweets for: {company_data['companyName']}")
+            if company_data["ceo"]:
+                print(f"👔 Fetching CEO news for: {company_data['ceo']}")
+            sources = await fetch_all_sources(company_data["companyName"], company_data["ceo"] or None, deadline)
+            combined_texts = collect_texts(sources)
         except Exception as e:
             print(f"❌ Data fetch error: {e}")
 
-        # Filter and deduplicate content
-        final_texts = filter_relevant_content(combined_texts, company_data)
-        
-        print(f"📊 Processing {len(final_texts)} relevant texts from news and social media")
+        try:
+            result = await asyncio.wait_for(
+                within_deadline(deadline, run_analysis(mode, combined_texts, company_data, trend_window)),
+                timeout=time_left(deadline),
+            )
+        except asyncio.TimeoutError:
+            print(f"⏱️ Analysis of {company_data['companyName']} exceeded the {ANALYZE_BUDGET}s budget")
+            result = over_budget_response(company_data, len(combined_texts))
         
-        # Analyze sentiment
-        result = analyze_sentiment(final_texts, company_data)
+        if company_data["isStartup"]:
+            await record_reputation(company_data["companyName"], result)
+        store_analyzed_texts(company_data, mode, combined_texts)
         
         return result
         
@@ -125,79 +191,688 @@ async def analyze_company(request: Request):
         print(f"❌ Analysis error: {e}")
         return {"error": f"Analysis failed: {str(e)}"}
 
-def filter_relevant_content(texts_data, company_data):
-    """Filter and deduplicate content based on relevance"""
+def over_budget_response(company_data, fetched_count):
+    return {
+        "company_info": company_data,
+        "analysis_result": {
+            "error": f"Analysis did not finish within {ANALYZE_BUDGET}s",
+            "fetched_count": fetched_count,
+        },
+        "status": "timeout"
+    }
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: Request):
+    """Analyze a portfolio of companies in one call.
+
+    Body: {"companies": [<analyze payload>, ...], "mode": "stream" | "job"}.
+    Identical provider queries across the batch are fetched once, and every
+    upstream call goes through the per-provider rate limiters at background
+    priority, leaving headroom for interactive /analyze calls. "stream"
+    returns NDJSON lines as companies finish; "job" returns a job id to poll
+    at GET /analyze/batch/{job_id}.
+    """
+    body = await request.json()
+    payloads = body.get("companies") or []
+    if not isinstance(payloads, list) or not payloads:
+        raise HTTPException(status_code=400, detail="companies must be a non-empty list")
+    if not all(isinstance(data, dict) for data in payloads):
+        raise HTTPException(status_code=400, detail="Every entry of companies must be an object")
+    for data in payloads:
+        analysis_options(data)
+
+    if body.get("mode") == "job":
+        expire_batch_jobs()
+        if len(BATCH_JOBS) >= BATCH_MAX_JOBS:
+            raise HTTPException(status_code=429, detail="Too many batch jobs running, try again later")
+        job_id = uuid.uuid4().hex
+        BATCH_JOBS[job_id] = {"status": "running", "total": len(payloads), "completed": 0, "results": []}
+        # Keep a reference: the event loop only holds a weak one to running tasks
+        task = asyncio.create_task(run_batch_job(job_id, payloads))
+        _batch_tasks.add(task)
+        task.add_done_callback(_batch_tasks.discard)
+        return {"job_id": job_id, "total": len(payloads)}
+
+    async def lines():
+        async for item in run_batch(payloads):
+            yield json.dumps(item, default=str) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/analyze/batch/{job_id}")
+async def analyze_batch_status(job_id: str):
+    expire_batch_jobs()
+    job = BATCH_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown batch job")
+    return job
+
+async def run_batch_job(job_id, payloads):
+    job = BATCH_JOBS[job_id]
+    try:
+        async for item in run_batch(payloads):
+            job["results"].append(item)
+            job["completed"] += 1
+        job["status"] = "done"
+    except Exception as e:
+        print(f"❌ Batch job {job_id} failed: {e}")
+        job["status"] = "error"
+        job["error"] = str(e)
+    finally:
+        _batch_finished[job_id] = time.monotonic()
+
+def expire_batch_jobs():
+    """Forget finished jobs older than BATCH_JOB_TTL, then the oldest finished
+    ones while BATCH_MAX_JOBS are held; running jobs are never dropped"""
+    now = time.monotonic()
+    for job_id, finished in list(_batch_finished.items()):
+        if now - finished < BATCH_JOB_TTL and len(BATCH_JOBS) < BATCH_MAX_JOBS:
+            break
+        del _batch_finished[job_id]
+        BATCH_JOBS.pop(job_id, None)
+
+async def run_batch(payloads):
+    """Yield {"index", "companyName", "result"} items in completion order"""
+    shared = {}
+    slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    def shared_fetch(label, provider, fetcher, args):
+        # One task per distinct provider query, however many companies need it
+        key = (provider, fetcher.__name__, normalize_query(args[0]), args[1:])
+        if key not in shared:
+            shared[key] = asyncio.create_task(
+                background(fetch_with_timeout(lambda: fetcher(*args), provider, label, BATCH_FETCH_TIMEOUT))
+            )
+        return shared[key]
+
+    async def analyze_one(index, data, company_data, fetches):
+        if not company_data["companyName"]:
+            return {"index": index, "error": "Company name is required"}
+        async with slots:
+            try:
+                await store_startup(company_data)
+                sources = empty_sources()
+                for label, fetch in fetches.items():
+                    sources[label] = source_results(await fetch)
+                mode, trend_window = analysis_options(data)
+                combined_texts = collect_texts(sources)
+                result = await run_analysis(mode, combined_texts, company_data, trend_window)
+                if company_data["isStartup"]:
+                    await record_reputation(company_data["companyName"], result)
+                store_analyzed_texts(company_data, mode, combined_texts)
+                return {"index": index, "companyName": company_data["companyName"], "result": result}
+            except Exception as e:
+                print(f"❌ Analysis error: {e}")
+                return {"index": index, "companyName": company_data["companyName"], "error": f"Analysis failed: {str(e)}"}
+
+    tasks = []
+    for index, data in enumerate(payloads):
+        company_data = parse_company_data(data)
+        fetches = {}
+        if company_data["companyName"]:
+            calls = source_calls(company_data["companyName"], company_data["ceo"] or None)
+            fetches = {label: shared_fetch(label, *call) for label, call in calls.items()}
+        tasks.append(asyncio.create_task(background(analyze_one(index, data, company_data, fetches))))
+    print(f"📦 Batch of {len(payloads)} companies, {len(shared)} distinct provider queries")
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks + list(shared.values()):
+            task.cancel()
+
+@app.post("/analyze/stream")
+async def analyze_company_stream(request: Request):
+    """Server-Sent Events variant of /analyze that reports each stage as it finishes.
+
+    Events: "started", one "source" per provider query, "texts" (the filtered
+    set), "preliminary" (local model scores, when available), then "result"
+    or "error". Closing the connection cancels the fetches still in flight.
+    """
+    data = await request.json()
+    company_data = parse_company_data(data)
+    if not company_data["companyName"]:
+        raise HTTPException(status_code=400, detail="Company name is required")
+    analysis_options(data)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream_analysis(data, company_data), media_type="text/event-stream", headers=headers)
+
+async def stream_analysis(data, company_data):
+    tasks = []
+    try:
+        yield sse_event("started", {"company": company_data["companyName"]})
+        await store_startup(company_data)
+
+        calls = source_calls(company_data["companyName"], company_data["ceo"] or None)
+        tasks = [asyncio.create_task(fetch_labeled(label, *call)) for label, call in calls.items()]
+        sources = empty_sources()
+        for finished in asyncio.as_completed(tasks):
+            label, response = await finished
+            sources[label] = source_results(response)
+            yield sse_event("source", {"source": label, "count": len(sources[label])})
+
+        combined_texts = collect_texts(sources)
+        mode, trend_window = analysis_options(data)
+        ranked = rank_relevant_content(combined_texts, company_data, text_limit(mode))
+        yield sse_event("texts", {"count": len(ranked), "texts": ranked})
+
+        final = asyncio.create_task(run_analysis(mode, combined_texts, company_data, trend_window))
+        tasks.append(final)
+        # Local mode's result is already local; hybrid loads the model anyway, and the
+        # remote modes only get a preview when it is loaded, so they never pull in torch
+        if mode == "hybrid" or (mode not in LOCAL_MODEL_MODES and model_ready()):
+            preliminary = asyncio.create_task(preliminary_scores(ranked))
+            tasks.append(preliminary)
+            done, _ = await asyncio.wait({final, preliminary}, return_when=asyncio.FIRST_COMPLETED)
+            if preliminary in done or not final.done():
+                summary = await preliminary
+                if summary:
+                    yield sse_event("preliminary", summary)
+
+        result = await final
+        if company_data["isStartup"]:
+            await record_reputation(company_data["companyName"], result)
+        store_analyzed_texts(company_data, mode, combined_texts)
+        yield sse_event("result", result)
+    except asyncio.CancelledError:
+        print(f"🛑 Client cancelled analysis for {company_data['companyName']}")
+        raise
+    except Exception as e:
+        print(f"❌ Analysis error: {e}")
+        yield sse_event("error", {"error": f"Analysis failed: {str(e)}"})
+    finally:
+        # Abort upstream work nobody is waiting for any more
+        for task in tasks:
+            task.cancel()
+
+async def preliminary_scores(ranked):
+    """Local-model counts and score for the filtered texts, or None if no local model"""
+    if not ranked:
+        return None
+    try:
+        predictions = await classify([item["text"] for item in ranked])
+    except Exception as e:
+        print(f"⚠️ Preliminary scoring unavailable: {e}")
+        return None
+    return local_summary(predictions)
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def parse_company_data(data):
+    """Company fields from an /analyze request body"""
+    return {
+        "companyName": data.get("companyName", "").strip(),
+        "ceo": data.get("ceo", "").strip(),
+        "country": data.get("country", "").strip(),  
+        "sector": data.get("sector", "").strip(),
+        "revenue": data.get("revenue", ""),
+        "employees": data.get("employees", ""),
+        "year": data.get("year", ""),
+        "ticker": data.get("ticker", ""),
+        "aliases": data.get("aliases", []),
+        "relevanceWeights": data.get("relevanceWeights", {}),
+        "links": data.get("links", ""),
+        "funding_range": data.get("fundingRange", "").strip(),
+        "isPublic": data.get("isPublic", False),
+        "isStartup": data.get("isStartup", False),
+        "email": data.get("contactInfo", ""),
+        "pitchDeck": data.get("pitchDeck", "")
+    }
+
+def analysis_options(data):
+    """(mode, trend window) for a request body; 400 before anything is fetched if either is unknown"""
+    mode = data.get("analysisMode") or ANALYSIS_MODE
+    if mode not in BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unknown analysis mode: {mode}")
+    trend_window = data.get("trendWindow") or TREND_WINDOW
+    if trend_window not in TREND_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"Unknown trend window: {trend_window}")
+    return mode, trend_window
+
+async def store_startup(company_data):
+    """Store startup data the first time a startup is analyzed"""
+    if not company_data["isStartup"]:
+        return
+    try:
+        existing = await asyncio.to_thread(company_collection.find_one, {"companyName": company_data["companyName"]})
+        if not existing:
+            # Insert a copy: insert_one adds an ObjectId _id, which would break the JSON response
+            await asyncio.to_thread(company_collection.insert_one, dict(company_data))
+            match_index.add(company_data)
+            print(f"✅ Stored startup: {company_data['companyName']}")
+    except Exception as e:
+        print(f"DB error: {e}")
+
+def collect_texts(sources):
+    """Flatten provider responses into {"text", "source", "timestamp"} items"""
+    combined_texts = []
+    
+    # Process news articles
+    all_news = sources["gnews_company"] + sources["newsapi_company"] + sources["gnews_ceo"] + sources["newsapi_ceo"]
+    for article in all_news:
+        title = article.get("title", "")
+        description = article.get("description", "")
+        content = article.get("content", "")
+        
+        # Combine title and description/content
+        text = f"{title}. {description or content}".strip()
+        if text and len(text) > 20:  # Filter out very short texts
+            combined_texts.append({
+                "text": text,
+                "source": "news",
+                "timestamp": article.get("publishedAt") or article.get("published_at"),
+                "id": article.get("url")
+            })
+    
+    # Process tweets
+    for tweet in sources["tweets"]:
+        tweet_text = tweet.get("text", "")
+        if tweet_text and not tweet_text.startswith("RT @"):  # Skip retweets
+            combined_texts.append({
+                "text": tweet_text,
+                "source": "twitter",
+                "timestamp": tweet.get("created_at"),
+                "id": f"tweet:{tweet['id']}" if tweet.get("id") else None
+            })
+    
+    return combined_texts
+
+async def run_analysis(mode, combined_texts, company_data, trend_window=None):
+    """Filter the fetched texts, run the selected analyzer over them and add trend_data"""
+    trend_window = trend_window or TREND_WINDOW
+    if trend_window not in TREND_WINDOWS:
+        raise ValueError(f"Unknown trend window: {trend_window}")
+    # First use of a mode imports its backend, so keep that off the event loop
+    analyze = await asyncio.to_thread(get_analyzer, mode)
+    # Every relevant text feeds the trend; only the top ones reach the analyzer
+    with span("filter"):
+        ranked = rank_relevant_content(combined_texts, company_data)
+    texts_total.inc(len(combined_texts), stage="fetched")
+    texts_total.inc(len(ranked), stage="kept")
+    texts_total.inc(sum(item["mentions"] - 1 for item in ranked), stage="duplicate")
+    selected = ranked[:text_limit(mode)]
+    print(f"📊 Processing {len(selected)} relevant texts from news and social media ({mode})")
+    scoring = None
+    if TREND_LOCAL_SCORES and mode not in LOCAL_MODEL_MODES and ranked and model_ready():
+        scoring = asyncio.create_task(trend_scores(ranked))
+    try:
+        with span(f"analyze.{mode}"):
+            result = await analyze(selected, company_data)
+    except BaseException:
+        if scoring:
+            scoring.cancel()
+        raise
+    if scoring is not None:
+        sentiments = await scoring
+    elif mode in LOCAL_MODEL_MODES and ranked:
+        # The analyzer just scored these texts with the local model; the sentiment cache answers
+        sentiments = await trend_scores(ranked)
+    else:
+        sentiments = None
+
+    if "analysis_result" not in result:
+        # Local mode has no analysis_result block
+        result["trend_data"] = trend_data(ranked, trend_window, sentiments)
+        return result
+    # Copy before filling in: the LLM result may be a shared cache entry
+    analysis = dict(result["analysis_result"])
+    analysis["trend_data"] = trend_data(ranked, trend_window, sentiments, analysis.get("score", 50))
+    return {**result, "analysis_result": analysis}
+
+def text_limit(mode):
+    """How many of the ranked texts the analyzer for ``mode`` receives"""
+    return {"hybrid": HYBRID_MAX_TEXTS, "chunked": CHUNKED_MAX_TEXTS}.get(mode, 25)
+
+async def trend_scores(ranked):
+    """Per-text 0-100 sentiment from the local model, or None if it fails"""
+    try:
+        predictions = await classify([item["text"] for item in ranked])
+    except Exception as e:
+        print(f"⚠️ Trend scores unavailable, using the overall score: {e}")
+        return None
+    return [50 + 50 * polarity(prediction) for prediction in predictions]
+
+def trend_data(ranked, window, sentiments=None, fallback_score=50):
+    """Mention-weighted sentiment per time bucket across every relevant text.
+
+    ``sentiments`` are per-text scores (see trend_scores); without them each
+    bucket carries the overall score and only the mention counts vary.
+    """
+    if not ranked:
+        return []
+    if sentiments is None:
+        sentiments = [fallback_score] * len(ranked)
+    with span("trend"):
+        return bucket_trend(
+            [item["timestamp"] for item in ranked],
+            sentiments,
+            [item["mentions"] for item in ranked],
+            window,
+        )
+
+async def refresh_startup(company):
+    """Incremental re-analysis: fetch only items newer than the last stored one,
+    score just those locally, and fold them into the stored aggregate."""
+    company_data = parse_company_data(company)
+    name = company_data["companyName"]
+    news_since = await asyncio.to_thread(article_store.last_seen, name, "news")
+    tweets_since = await asyncio.to_thread(article_store.last_seen, name, "twitter")
+    calls = source_calls(name, company_data["ceo"] or None, news_since, tweets_since)
+    responses = await asyncio.gather(*(
+        fetch_labeled(label, *call, timeout=BATCH_FETCH_TIMEOUT) for label, call in calls.items()
+    ))
+    sources = empty_sources()
+    for label, response in responses:
+        sources[label] = source_results(response)
+
+    await store_new_items(name, rank_relevant_content(collect_texts(sources), company_data))
+
+async def store_new_items(name, ranked):
+    """Score the ranked items missing from the article store with the local model,
+    insert them and fold them into the startup's aggregate"""
+    seen = await asyncio.to_thread(article_store.known_ids, name, ranked)
+    new_items = [item for item in ranked if item.get("id") and article_store.article_id(name, item) not in seen]
+    if not new_items:
+        return
+
+    predictions = await classify([item["text"] for item in new_items])
+    inserted = await asyncio.to_thread(article_store.store_articles, name, new_items, predictions)
+    if not inserted:
+        return
+    aggregate = await asyncio.to_thread(article_store.merge_aggregate, name, inserted)
+    print(f"🔄 {name}: {len(inserted)} new texts, {aggregate.get('texts', 0)} total")
+
+def store_analyzed_texts(company_data, mode, combined_texts):
+    """After an analysis of a startup, add its texts to the article store in the
+    background, which also moves the refresh watermarks (last_seen) forward.
+    Skipped unless the local model is loaded or the mode loads it anyway."""
+    if not (company_data["isStartup"] and combined_texts and (mode in LOCAL_MODEL_MODES or model_ready())):
+        return
+
+    async def store():
+        try:
+            await store_new_items(company_data["companyName"], rank_relevant_content(combined_texts, company_data))
+        except Exception as e:
+            print(f"❌ Article store error for {company_data['companyName']}: {e}")
+
+    # Keep a reference: the event loop only holds a weak one to running tasks
+    task = asyncio.create_task(store())
+    _store_tasks.add(task)
+    task.add_done_callback(_store_tasks.discard)
+
+def list_startups():
+    return list(company_collection.find({"isStartup": True}, {"_id": 0, "pitchDeck": 0}))
+
+async def record_reputation(company_name, result):
+    """Keep the latest reputation score on the startup for ranked matching"""
+    score = (result.get("analysis_result") or {}).get("score")
+    if result.get("status") != "success" or not isinstance(score, (int, float)):
+        return
+    match_index.update_reputation(company_name, score)
+    try:
+        await asyncio.to_thread(
+            company_collection.update_one, {"companyName": company_name}, {"$set": {"reputation_score": score}}
+        )
+    except Exception as e:
+        print(f"DB error: {e}")
+
+async def fetch_with_timeout(call, provider, label, timeout=None):
+    """Run one provider call under its deadline and circuit breaker, degrading to an empty result.
+
+    ``call`` creates the request coroutine; it runs twice when the provider
+    has hedging enabled and the first attempt is slow.
+    """
+    timeout = PROVIDER_TIMEOUTS[provider] if timeout is None else timeout
+    circuit = breaker(provider)
+    if not circuit.allow():
+        upstream_errors.inc(provider=provider, status="circuit_open")
+        print(f"⛔ {label} skipped: {provider} circuit is open")
+        return None
+    try:
+        with span(f"fetch.{provider}"):
+            result = await asyncio.wait_for(hedged(call, hedge_after(provider)), timeout=timeout)
+    except asyncio.CancelledError:
+        circuit.release()
+        raise
+    except asyncio.TimeoutError:
+        upstream_errors.inc(provider=provider, status="timeout")
+        print(f"⏱️ {label} timed out after {timeout:.1f}s")
+    except httpx.HTTPError as e:
+        upstream_errors.inc(provider=provider, status="connection")
+        print(f"❌ {label} fetch error: {e}")
+    except Exception as e:
+        print(f"❌ {label} fetch error: {e}")
+    else:
+        # News fetchers report HTTP errors in the payload instead of raising
+        if isinstance(result, dict) and "error" in result:
+            circuit.record_failure()
+        else:
+            circuit.record_success()
+        return result
+    circuit.record_failure()
+    return None
+
+def source_calls(company_query, ceo_query=None, since=None, tweets_since=None):
+    """label -> (provider, fetcher, args) for every provider query of one analysis.
+
+    ``since`` (ISO 8601) limits the news providers to items newer than that
+    time, and ``tweets_since`` does the same for Twitter.
+    """
+    calls = {
+        "gnews_company": ("gnews", fetch_gnews_data_async, (company_query, since)),
+        "newsapi_company": ("newsapi", fetch_newsapi_data_async, (company_query, since)),
+        "tweets": ("twitter", fetch_tweets_async, (company_query, 10, tweets_since)),
+    }
+    if ceo_query:
+        calls["gnews_ceo"] = ("gnews", fetch_gnews_data_async, (ceo_query, since))
+        calls["newsapi_ceo"] = ("newsapi", fetch_newsapi_data_async, (ceo_query, since))
+    return calls
+
+async def fetch_labeled(label, provider, fetcher, args, timeout=None):
+    return label, await fetch_with_timeout(lambda: fetcher(*args), provider, label, timeout)
+
+def empty_sources():
+    return {"gnews_company": [], "newsapi_company": [], "gnews_ceo": [], "newsapi_ceo": [], "tweets": []}
+
+def source_results(response):
+    if isinstance(response, dict):
+        return response.get("results", [])
+    return response or []
+
+async def fetch_all_sources(company_query, ceo_query=None, deadline=None):
+    """Fan out every provider query at once; latency is the slowest single provider.
+
+    With a ``deadline`` (event loop time) no fetch outlives the request budget.
+    """
+    calls = source_calls(company_query, ceo_query)
+    timeouts = {
+        label: PROVIDER_TIMEOUTS[provider] if deadline is None else min(PROVIDER_TIMEOUTS[provider], time_left(deadline))
+        for label, (provider, _, _) in calls.items()
+    }
+    responses = await asyncio.gather(*(
+        fetch_labeled(label, *call, timeout=timeouts[label]) for label, call in calls.items()
+    ))
+
+    sources = empty_sources()
+    for label, response in responses:
+        sources[label] = source_results(response)
+    return sources
+
+def time_left(deadline):
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+def rank_relevant_content(texts_data, company_data, limit=None):
+    """Top relevant texts with source/timestamp metadata, highest relevance first.
+
+    Near-duplicates (syndicated copies of the same story) are folded into the
+    first copy seen, and the cluster size is kept as its "mentions" count.
+    """
     if not texts_data:
         return []
     
-    company_lower = company_data["companyName"].lower()
-    ceo_lower = company_data["ceo"].lower() if company_data["ceo"] else ""
-    sector_keywords = get_sector_keywords(company_data.get("sector", ""))
+    duplicates = NearDuplicateIndex(DEDUP_SIMILARITY)
+    candidates = []
     
-    relevant_texts = []
-    seen_texts = set()
-    
-    for item in texts_data:
-        text = item["text"]
-        text_lower = text.lower()
-        
-        # Skip duplicates
-        text_hash = hash(text_lower[:100])  # Hash first 100 chars to check similarity
-        if text_hash in seen_texts:
+    for order, item in enumerate(texts_data):
+        # Fold near-duplicates into their cluster as extra mentions
+        cluster, is_new = duplicates.add(item["text"])
+        if not is_new:
+            candidates[cluster]["mentions"] += 1
             continue
-        seen_texts.add(text_hash)
-        
-        # Relevance scoring
-        relevance_score = 0
-        
-        # Direct company name match
-        if company_lower in text_lower:
-            relevance_score += 10
-        
-        # CEO name match
-        if ceo_lower and ceo_lower in text_lower:
-            relevance_score += 8
-        
-        # Sector keywords
-        for keyword in sector_keywords:
-            if keyword in text_lower:
-                relevance_score += 3
-                break
-        
-        # Prioritize recent content and longer texts
-        if len(text) > 100:
-            relevance_score += 2
         
+        candidates.append({
+            "text": item["text"],
+            "source": item.get("source"),
+            "timestamp": item.get("timestamp"),
+            "id": item.get("id"),
+            "mentions": 1,
+            "order": order,
+        })
+    
+    # Relevance scoring for every unique text in one batch with the company's compiled matcher
+    scores = matcher_for(company_data).score_batch([entry["text"] for entry in candidates])
+    relevant_texts = []
+    for entry, relevance_score in zip(candidates, scores):
         # Only include if relevant
-        if relevance_score >= 5:
-            relevant_texts.append(text)
+        if relevance_score >= RELEVANCE_MIN_SCORE:
+            entry["relevance"] = relevance_score
+            relevant_texts.append(entry)
     
-    # Limit to top 25 most relevant texts
-    return relevant_texts[:25]
-
-def get_sector_keywords(sector):
-    """Get relevant keywords based on sector"""
-    sector_map = {
-        "technology": ["tech", "software", "ai", "digital", "innovation"],
-        "aviation": ["airline", "flight", "aircraft", "airport", "aviation"],
-        "finance": ["bank", "financial", "money", "investment", "credit"],
-        "healthcare": ["health", "medical", "hospital", "pharma", "medicine"],
-        "retail": ["store", "shopping", "customer", "sales", "retail"],
-        "energy": ["energy", "oil", "gas", "renewable", "power"],
-        "automotive": ["car", "vehicle", "auto", "transport", "mobility"]
+    rank = lambda entry: (entry["relevance"], entry["mentions"], -entry["order"])
+    if limit is None:
+        return sorted(relevant_texts, key=rank, reverse=True)
+    return heapq.nlargest(limit, relevant_texts, key=rank)
+
+@app.post("/startups/{company_name}/pitch-deck")
+async def upload_pitch_deck(company_name: str, request: Request):
+    """Store a pitch deck file (multipart field "file") for a startup, replacing any earlier upload.
+
+    Oversized uploads are refused from Content-Length before any of the body
+    is read. The multipart body is then spooled to disk by the parser and
+    copied into GridFS in chunks; only a reference is written to the company
+    document.
+    """
+    try:
+        declared = int(request.headers["content-length"])
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=411, detail="Content-Length is required")
+    if declared > deck_store.MAX_DECK_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Pitch deck is larger than {deck_store.MAX_DECK_BYTES} bytes")
+    company = await asyncio.to_thread(
+        company_collection.find_one, {"companyName": company_name}, {"pitchDeckFile": 1}
+    )
+    if not company:
+        raise HTTPException(status_code=404, detail="Startup not found")
+
+    async with request.form(max_files=1, max_fields=10) as form:
+        file = form.get("file")
+        if not isinstance(file, StarletteUploadFile):
+            raise HTTPException(status_code=400, detail="Missing pitch deck file")
+        if file.content_type not in deck_store.CONTENT_TYPES:
+            raise HTTPException(status_code=415, detail="Pitch deck must be a PDF, PowerPoint or Keynote file")
+        try:
+            deck = await asyncio.to_thread(deck_store.save, file.file, file.filename, file.content_type, company_name)
+        except deck_store.DeckTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+    await asyncio.to_thread(
+        company_collection.update_one, {"_id": company["_id"]}, {"$set": {"pitchDeckFile": deck}}
+    )
+    previous = company.get("pitchDeckFile")
+    if previous:
+        try:
+            await asyncio.to_thread(deck_store.delete, previous["fileId"])
+        except Exception as e:
+            print(f"DB error: {e}")
+    print(f"✅ Stored pitch deck for {company_name}: {deck['length']} bytes")
+    return {"status": "success", "pitchDeckFile": deck}
+
+@app.get("/startups/{company_name}/pitch-deck")
+async def download_pitch_deck(company_name: str, request: Request):
+    """Serve a stored pitch deck; honours a single "Range: bytes=..." header with 206"""
+    company = await asyncio.to_thread(
+        company_collection.find_one, {"companyName": company_name}, {"pitchDeckFile": 1}
+    )
+    deck = (company or {}).get("pitchDeckFile")
+    if not deck:
+        raise HTTPException(status_code=404, detail="No pitch deck uploaded")
+
+    length = deck["length"]
+    try:
+        requested = deck_store.byte_range(request.headers.get("range"), length)
+    except ValueError:
+        return PlainTextResponse(
+            "Requested range not satisfiable", status_code=416, headers={"Content-Range": f"bytes */{length}"}
+        )
+    start, end = requested or (0, length - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(max(0, end - start + 1)),
+        "Content-Disposition": f"inline; filename*=utf-8''{quote(deck['filename'])}",
     }
-    return sector_map.get(sector.lower(), [])
+    if requested:
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    # A sync generator: StreamingResponse reads it in the threadpool
+    body = deck_store.read_range(deck["fileId"], start, end) if length else iter(())
+    return StreamingResponse(
+        body, status_code=206 if requested else 200, media_type=deck["contentType"], headers=headers
+    )
 
 @app.get("/")
 async def root():
     return {"message": "Company Analysis API - Ready", "status": "running"}
 
+@app.get("/cache-stats")
+async def cache_stats():
+    sentiment_cache = get_sentiment_cache()
+    # The Gemini backend may not have been imported by this worker yet
+    gemini = sys.modules.get("analyzers.openrouter_sentiment")
+    return {
+        "fetch_cache": fetch_cache.stats(),
+        "gemini_cache": gemini.result_cache.stats() if gemini else None,
+        "sentiment_cache": sentiment_cache.stats() if sentiment_cache else None,
+        "analysis_backends": loaded_modes(),
+    }
+
+def cache_lookups():
+    """Cache hit/miss totals for /metrics, read from each cache's own counters"""
+    caches = {"fetch": fetch_cache, "sentiment": get_sentiment_cache()}
+    gemini = sys.modules.get("analyzers.openrouter_sentiment")
+    if gemini:
+        caches["gemini"] = gemini.result_cache
+    samples = {}
+    for name, cache in caches.items():
+        if cache is None:
+            continue
+        stats = cache.stats()
+        for result in ("hits", "stale_hits", "misses"):
+            if result in stats:
+                samples[(name, result)] = stats[result]
+    return samples
+
+CallbackCounter("cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"], cache_lookups)
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.post("/search-investment-opportunities")
 async def search_investments(request: Request):
+    """Keyset-paginated startup search.
+
+    Body filters: sector, fundingRange, employees (or employeeRange), country.
+    Paging: pageSize and cursor (the next_cursor of the previous page); a
+    body with neither gets every match in one response, as before paging.
+    fields="full" returns whole documents; stream=true returns every match
+    as NDJSON instead of a page.
+    """
     body = await request.json()
     sector = body.get("sector")
     funding = body.get("fundingRange")
-    employees = body.get("employees")
+    employees = body.get("employees") or body.get("employeeRange")
     country = body.get("country")
 
     query = {}
@@ -211,8 +886,69 @@ async def search_investments(request: Request):
     if country:
         query["country"] = country
 
+    projection = None if body.get("fields") == "full" else {field: 1 for field in LIST_FIELDS}
+
+    if body.get("stream"):
+        return StreamingResponse(stream_matches(query, projection), media_type="application/x-ndjson")
+
+    if body.get("pageSize") is None and not body.get("cursor"):
+        try:
+            matches = await asyncio.to_thread(lambda: list(company_collection.find(query, projection).sort("_id", 1)))
+        except Exception as e:
+            return JSONResponse(status_code=500, content={"error": f"Database query failed: {str(e)}"})
+        for match in matches:
+            match.pop("_id", None)
+        return {"matches": matches, "next_cursor": None}
+
+    page_size = page_size_param(body, "pageSize")
+    cursor = body.get("cursor")
+    if cursor:
+        try:
+            query["_id"] = {"$gt": ObjectId(cursor)}
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
     try:
-        results = list(company_collection.find(query, {"_id": 0}))  # exclude MongoDB _id
-        return {"matches": results}
+        # Fetch one extra document to know whether another page exists
+        results = await asyncio.to_thread(
+            lambda: list(company_collection.find(query, projection).sort("_id", 1).limit(page_size + 1))
+        )
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": f"Database query failed: {str(e)}"})
+
+    next_cursor = str(results[page_size - 1]["_id"]) if len(results) > page_size else None
+    matches = results[:page_size]
+    for match in matches:
+        match.pop("_id", None)  # exclude MongoDB _id
+    return {"matches": matches, "next_cursor": next_cursor}
+
+def page_size_param(body, name):
+    """Requested page size clamped to 1..SEARCH_MAX_PAGE_SIZE; 400 if not an integer"""
+    try:
+        size = int(body.get(name) or SEARCH_PAGE_SIZE)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"{name} must be an integer")
+    return max(1, min(size, SEARCH_MAX_PAGE_SIZE))
+
+def stream_matches(query, projection):
+    """Yield every match as one JSON line without materializing the result set"""
+    try:
+        for document in company_collection.find(query, projection, batch_size=500).sort("_id", 1):
+            document.pop("_id", None)
+            yield json_util.dumps(document) + "\n"
+    except Exception as e:
+        yield json_util.dumps({"error": f"Database query failed: {str(e)}"}) + "\n"
+
+@app.post("/match-startups")
+async def match_startups(request: Request):
+    """Top-K startups ranked by weighted match score, served from the in-memory index"""
+    body = await request.json()
+    matches = match_index.search(
+        sector=body.get("sector"),
+        country=body.get("country"),
+        funding_range=body.get("fundingRange"),
+        employees=body.get("employees") or body.get("employeeRange"),
+        top_k=page_size_param(body, "topK"),
+        use_reputation=bool(body.get("useReputation", True)),
+    )
+    return {"matches": matches}
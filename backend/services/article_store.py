@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+
+from pymongo import DESCENDING, UpdateOne
+
+from database import article_collection, company_collection
+
+def parse_timestamp(value):
+    """Parse provider timestamps ("2025-06-27T10:29:50.000Z") into aware UTC datetimes"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def format_timestamp(value):
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def article_id(company_name, item):
+    """Store key: one document per company and article URL / tweet id"""
+    return f"{company_name}::{item['id']}"
+
+def last_seen(company_name, source):
+    """Newest stored publishedAt/created_at for a company and source ("news" or
+    "twitter"), as an ISO string. Each source keeps its own watermark so a fresh
+    tweet does not hide news articles that were indexed late."""
+    latest = article_collection.find_one(
+        {"company": company_name, "source": source, "published_at": {"$ne": None}},
+        {"published_at": 1},
+        sort=[("published_at", DESCENDING)],
+    )
+    return format_timestamp(latest["published_at"]) if latest else None
+
+def known_ids(company_name, items):
+    ids = [article_id(company_name, item) for item in items if item.get("id")]
+    if not ids:
+        return set()
+    return {doc["_id"] for doc in article_collection.find({"_id": {"$in": ids}}, {"_id": 1})}
+
+def store_articles(company_name, items, predictions):
+    """Insert newly scored texts; texts already stored are left untouched.
+
+    Returns the predictions of the texts this call actually inserted, so a
+    concurrent refresh (e.g. in another worker) cannot count a text twice.
+    """
+    stored = [(item, prediction) for item, prediction in zip(items, predictions) if item.get("id")]
+    operations = []
+    for item, prediction in stored:
+        operations.append(UpdateOne(
+            {"_id": article_id(company_name, item)},
+            {"$setOnInsert": {
+                "company": company_name,
+                "source": item.get("source"),
+                "text": item["text"],
+                "published_at": parse_timestamp(item.get("timestamp")),
+                "label": prediction["label"],
+                "confidence": prediction["confidence"],
+                "scores": prediction.get("scores", {}),
+            }},
+            upsert=True,
+        ))
+    if not operations:
+        return []
+    result = article_collection.bulk_write(operations, ordered=False)
+    return [stored[index][1] for index in sorted(result.upserted_ids)]
+
+def merge_aggregate(company_name, predictions):
+    """Fold new per-text scores into the running totals on the company document.
+
+    Returns the updated aggregate, whose local model score covers every text
+    scored so far, not just this refresh. It is stored as
+    ``local_reputation_score`` and never replaces the Gemini ``reputation_score``.
+    """
+    counts = {"Positive": 0, "Negative": 0, "Neutral": 0}
+    polarity = 0.0
+    for prediction in predictions:
+        counts[prediction["label"]] = counts.get(prediction["label"], 0) + 1
+        scores = prediction.get("scores", {})
+        polarity += scores.get("positive", 0.0) - scores.get("negative", 0.0)
+
+    document = company_collection.find_one_and_update(
+        {"companyName": company_name},
+        {"$inc": {
+            "aggregate.texts": len(predictions),
+            "aggregate.positive": counts["Positive"],
+            "aggregate.negative": counts["Negative"],
+            "aggregate.neutral": counts["Neutral"],
+            "aggregate.polarity_sum": polarity,
+        }, "$set": {"aggregate.refreshed_at": datetime.now(timezone.utc)}},
+        projection={"aggregate": 1},
+        return_document=True,
+    )
+    aggregate = (document or {}).get("aggregate", {})
+    if aggregate.get("texts"):
+        aggregate["score"] = round(50 + 50 * aggregate["polarity_sum"] / aggregate["texts"])
+        company_collection.update_one(
+            {"companyName": company_name}, {"$set": {"local_reputation_score": aggregate["score"]}}
+        )
+    return aggregate
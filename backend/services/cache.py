@@ -0,0 +1,189 @@
+import asyncio
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+FRESH = "fresh"
+STALE = "stale"
+
+class TTLCache:
+    """Bounded LRU cache with a freshness TTL and an optional stale window.
+
+    Entries younger than ``ttl`` are fresh. Entries older than that but younger
+    than ``ttl + stale_ttl`` are still returned, flagged stale, so callers can
+    serve them while refreshing. When ``path`` is set, entries are also written
+    to a SQLite file so they survive restarts; coroutines should then use
+    ``alookup``/``aset``, which do that I/O in a worker thread. Values must be
+    JSON-serializable.
+    """
+
+    def __init__(self, maxsize=256, ttl=600, stale_ttl=0, path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, stored_at REAL)"
+            )
+            self._db.commit()
+
+    def _state(self, stored_at):
+        age = time.time() - stored_at
+        if age < self.ttl:
+            return FRESH
+        if age < self.ttl + self.stale_ttl:
+            return STALE
+        return None
+
+    def _load(self, key):
+        row = self._db.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def lookup(self, key):
+        """Return ``(value, state)`` where state is FRESH, STALE or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._remember(key, entry)
+            state = self._state(entry[1]) if entry else None
+            if state is None:
+                if entry is not None:
+                    self._forget(key)
+                self.misses += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if state == FRESH:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry[0], state
+
+    def set(self, key, value):
+        entry = (value, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), entry[1]),
+                )
+                self._db.commit()
+
+    async def alookup(self, key):
+        if self._db is None:
+            return self.lookup(key)
+        return await asyncio.to_thread(self.lookup, key)
+
+    async def aset(self, key, value):
+        if self._db is None:
+            self.set(key, value)
+        else:
+            await asyncio.to_thread(self.set, key, value)
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache WHERE key = ?", (evicted,))
+                self._db.commit()
+
+    def _forget(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    def stats(self):
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+def normalize_query(query):
+    return " ".join(str(query).lower().split())
+
+def make_key(provider, query, params=None):
+    """Stable cache key for a (provider, normalized query, params) triple"""
+    return json.dumps([provider, normalize_query(query), params or {}], sort_keys=True, default=str)
+
+def is_cacheable(value):
+    # Provider error payloads look like {"source": ..., "error": status}
+    return not (isinstance(value, dict) and "error" in value)
+
+
+fetch_cache = TTLCache(
+    maxsize=int(os.getenv("FETCH_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("FETCH_CACHE_TTL", "600")),
+    stale_ttl=float(os.getenv("FETCH_CACHE_STALE_TTL", "3600")),
+    path=os.getenv("FETCH_CACHE_PATH") or None,
+)
+
+_refreshing = set()
+# Running refresh tasks; the event loop itself only keeps weak references
+_refresh_tasks = set()
+
+def cached_fetch(provider, cache=fetch_cache):
+    """Cache an async fetcher, serving stale entries while refreshing in the background.
+
+    Arguments are bound to the fetcher's signature (defaults applied) before
+    keying, so ``f(q, 10)`` and ``f(q, max_results=10)`` share an entry.
+    """
+    def decorator(fetch):
+        signature = inspect.signature(fetch)
+        query_name = next(iter(signature.parameters))
+
+        async def refresh(key, bound):
+            try:
+                value = await fetch(*bound.args, **bound.kwargs)
+                if is_cacheable(value):
+                    await cache.aset(key, value)
+            except Exception as e:
+                print(f"❌ Background refresh failed for {provider}: {e}")
+            finally:
+                _refreshing.discard(key)
+
+        @functools.wraps(fetch)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            key = make_key(provider, params.pop(query_name), params)
+            value, state = await cache.alookup(key)
+            if state == STALE and key not in _refreshing:
+                _refreshing.add(key)
+                task = asyncio.create_task(refresh(key, bound))
+                _refresh_tasks.add(task)
+                task.add_done_callback(_refresh_tasks.discard)
+            if state is not None:
+                return value
+
+            value = await fetch(*bound.args, **bound.kwargs)
+            if is_cacheable(value):
+                await cache.aset(key, value)
+            return value
+
+        return wrapper
+    return decorator
@@ -0,0 +1,103 @@
+"""Pitch deck files kept in GridFS (bucket "pitchDecks"), outside the companies documents.
+
+Uploads are copied into GridFS CHUNK_SIZE bytes at a time and downloads are
+read back the same way, so memory use does not grow with the deck size. The
+company document only keeps a small reference (see ``save``).
+"""
+import os
+import re
+from datetime import timezone
+
+import gridfs
+from bson import ObjectId
+
+from database import get_db
+
+CHUNK_SIZE = 255 * 1024
+MAX_DECK_BYTES = int(os.getenv("PITCH_DECK_MAX_BYTES", str(50 * 1024 * 1024)))
+
+CONTENT_TYPES = {
+    "application/pdf",
+    "application/vnd.ms-powerpoint",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "application/vnd.apple.keynote",
+}
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class DeckTooLarge(Exception):
+    pass
+
+def bucket():
+    return gridfs.GridFSBucket(get_db(), bucket_name="pitchDecks")
+
+def save(source, filename, content_type, company):
+    """Copy a file object into GridFS; returns the reference stored on the company"""
+    grid_in = bucket().open_upload_stream(
+        filename or "pitch-deck",
+        chunk_size_bytes=CHUNK_SIZE,
+        metadata={"company": company, "contentType": content_type},
+    )
+    size = 0
+    try:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_DECK_BYTES:
+                raise DeckTooLarge(f"Pitch deck is larger than {MAX_DECK_BYTES} bytes")
+            grid_in.write(chunk)
+    except BaseException:
+        grid_in.abort()
+        raise
+    grid_in.close()
+    uploaded = grid_in.upload_date.replace(tzinfo=timezone.utc)
+    return {
+        "fileId": str(grid_in._id),
+        "filename": grid_in.filename,
+        "contentType": content_type,
+        "length": size,
+        "uploadDate": uploaded.isoformat(timespec="seconds"),
+    }
+
+def delete(file_id):
+    try:
+        bucket().delete(ObjectId(file_id))
+    except gridfs.errors.NoFile:
+        pass
+
+def byte_range(header, length):
+    """(start, end) inclusive for a single-range Range header, or None to send the whole file.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = _RANGE.match((header or "").strip())
+    if not match:
+        return None  # absent, multi-range or another unit: serve everything
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if not suffix or not length:
+            raise ValueError("Unsatisfiable range")
+        return max(0, length - suffix), length - 1
+    start = int(first)
+    end = min(int(last), length - 1) if last else length - 1
+    if start >= length or end < start:
+        raise ValueError("Unsatisfiable range")
+    return start, end
+
+def read_range(file_id, start, end):
+    """Yield bytes start..end (inclusive) of a stored deck, CHUNK_SIZE at a time"""
+    with bucket().open_download_stream(ObjectId(file_id)) as grid_out:
+        grid_out.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = grid_out.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
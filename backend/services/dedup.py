@@ -0,0 +1,64 @@
+import hashlib
+import re
+
+import numpy as np
+
+SIMHASH_BITS = 64
+_WORD = re.compile(r"\w+")
+
+def simhash(text):
+    """64-bit SimHash fingerprint over the text's distinct words.
+
+    Each word's 64-bit hash votes on every bit; similar texts differ in few
+    bits, even when a headline gains a prefix or a reworded clause.
+    """
+    words = set(_WORD.findall(text.lower()))
+    if not words:
+        return 0
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little") for word in words),
+        dtype=np.uint64,
+        count=len(words),
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0) * 2 > len(words)
+    return int.from_bytes(np.packbits(votes, bitorder="little").tobytes(), "little")
+
+class NearDuplicateIndex:
+    """Clusters texts whose SimHash similarity is at least ``threshold``.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two fingerprints
+    within ``max_distance`` bits must agree on at least one band, so each new
+    text is only compared against clusters sharing a band. That keeps
+    insertion close to constant time instead of scanning every earlier text.
+    """
+
+    def __init__(self, threshold=0.9):
+        self.max_distance = int((1 - threshold) * SIMHASH_BITS)
+        bands = min(self.max_distance + 1, SIMHASH_BITS)
+        width = SIMHASH_BITS // bands
+        self._bands = [
+            (i * width, SIMHASH_BITS if i == bands - 1 else (i + 1) * width)
+            for i in range(bands)
+        ]
+        self._buckets = {}
+        self._fingerprints = []
+
+    def _band_keys(self, fingerprint):
+        for i, (start, end) in enumerate(self._bands):
+            yield i, fingerprint >> start & ((1 << (end - start)) - 1)
+
+    def add(self, text):
+        """Return the id of the cluster ``text`` joins, and whether it is new"""
+        fingerprint = simhash(text)
+        keys = list(self._band_keys(fingerprint))
+        for key in keys:
+            for cluster in self._buckets.get(key, ()):
+                if bin(fingerprint ^ self._fingerprints[cluster]).count("1") <= self.max_distance:
+                    return cluster, False
+
+        cluster = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(cluster)
+        return cluster, True
@@ -0,0 +1,21 @@
+import httpx
+
+# One keep-alive connection pool shared by every outbound provider call
+_client = None
+
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+def get_client():
+    """Return the shared async HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=DEFAULT_TIMEOUT)
+    return _client
+
+async def close_client():
+    """Close the shared client and release pooled connections"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -0,0 +1,285 @@
+"""In-memory investor-startup matching.
+
+Every startup gets a bit position. Sector, country, funding and headcount
+buckets and reputation bands each map to a Python int used as a bitset, so
+a query is a few dozen big-int AND/OR operations over the whole portfolio,
+and ranking only walks the members of the best-scoring tiers.
+"""
+import functools
+import itertools
+import math
+import re
+import threading
+
+# Share of the match score each criterion contributes
+MATCH_WEIGHTS = {
+    "sector": 0.35,
+    "funding": 0.25,
+    "employees": 0.15,
+    "country": 0.15,
+    "reputation": 0.10,
+}
+
+# An adjacent (non-overlapping but neighbouring) range earns this share of its weight
+ADJACENT_CREDIT = 0.5
+
+UNITS = {
+    "k": 1e3, "thousand": 1e3,
+    "l": 1e5, "lakh": 1e5, "lakhs": 1e5,
+    "m": 1e6, "mn": 1e6, "million": 1e6,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+    "b": 1e9, "bn": 1e9, "billion": 1e9,
+}
+
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)\s*([a-z]+)?")
+_WORD = re.compile(r"[a-z]+")
+
+# Buckets follow the 1-2-5 series (1, 2, 5, 10, 20, 50, ...) so the usual
+# range boundaries start a bucket and neighbouring ranges land side by side
+BUCKETS_PER_DECADE = 3
+MAX_BUCKET = 45
+REPUTATION_BANDS = 10
+
+@functools.lru_cache(maxsize=4096)
+def parse_range(value):
+    """Parse "1 - 5 Cr", "$1M-$5M", "11-50", "5001+", "Less than 10" into (low, high)"""
+    if value is None:
+        return None
+    text = str(value).lower().replace(",", "")
+    numbers = []
+    for number, unit in _NUMBER.findall(text):
+        numbers.append([float(number), UNITS.get(unit) if unit else None])
+    if not numbers:
+        return None
+
+    # "1 - 5 Cr", "1000+ Cr": a trailing unit applies to numbers written without one
+    units = [UNITS[word] for word in _WORD.findall(text) if word in UNITS]
+    default_unit = units[-1] if units else 1.0
+    values = [number * (unit or default_unit) for number, unit in numbers]
+
+    # Whole words only: "turnover" is not "over", "founder" is not "under"
+    words = _WORD.findall(text)
+    phrases = set(words) | {" ".join(pair) for pair in zip(words, words[1:])}
+    if "<" in text or phrases & {"less than", "under", "below", "up to"}:
+        return 0.0, values[0]
+    if "+" in text or phrases & {"above", "more than", "over"}:
+        return values[0], math.inf
+    if len(values) == 1:
+        return values[0], values[0]
+    return min(values[0], values[1]), max(values[0], values[1])
+
+def bucket(value):
+    if value == math.inf:
+        return MAX_BUCKET
+    if value < 1:
+        return 0
+    decade = math.floor(math.log10(value))
+    mantissa = value / 10 ** decade
+    step = 0 if mantissa < 2 else 1 if mantissa < 5 else 2
+    return min(decade * BUCKETS_PER_DECADE + step, MAX_BUCKET)
+
+def bucket_span(interval):
+    """Buckets an interval covers; the upper bound is exclusive ("1 - 5 Cr" stops before 5 Cr)"""
+    low, high = interval
+    if high > low and high != math.inf:
+        high = high * (1 - 1e-9)
+    return range(bucket(low), bucket(high) + 1)
+
+@functools.lru_cache(maxsize=4096)
+def range_buckets(value):
+    interval = parse_range(value)
+    return tuple(bucket_span(interval)) if interval else ()
+
+def normalize(value):
+    return str(value or "").strip().lower()
+
+class MatchIndex:
+    def __init__(self, weights=None):
+        self.weights = weights or MATCH_WEIGHTS
+        # Reentrant: load() holds it and calls add() for repeated names
+        self._lock = threading.RLock()
+        self._docs = []
+        self._keys = []
+        self._positions = {}
+        self._alive = 0
+        self._sector = {}
+        self._country = {}
+        self._funding = [0] * (MAX_BUCKET + 1)
+        self._employees = [0] * (MAX_BUCKET + 1)
+        self._reputation = [0] * (REPUTATION_BANDS + 1)  # last band = unknown
+
+    def __len__(self):
+        return bin(self._alive).count("1")
+
+    def load(self, documents):
+        """Bulk-load startups, building each bitset once instead of per insert.
+
+        Holds the index lock throughout, so it can run in a worker thread
+        while requests keep adding startups on the event loop.
+        """
+        # Last document wins for a name that appears more than once
+        latest = {}
+        for document in documents:
+            if document.get("companyName"):
+                latest[document["companyName"]] = document
+        with self._lock:
+            members = {}
+            for name, document in latest.items():
+                if name in self._positions:
+                    self.add(document)
+                    continue
+                position = len(self._docs)
+                self._positions[name] = position
+                keys = self._bits_for(document)
+                self._keys.append(keys)
+                self._docs.append({k: v for k, v in document.items() if k != "_id"})
+                for key in keys:
+                    members.setdefault(key, []).append(position)
+
+            size = len(self._docs) // 8 + 1
+            for (name, key), positions in members.items():
+                bitmap = bytearray(size)
+                for position in positions:
+                    bitmap[position >> 3] |= 1 << (position & 7)
+                table = self._table(name)
+                current = table.get(key, 0) if isinstance(table, dict) else table[key]
+                table[key] = current | int.from_bytes(bitmap, "little")
+            self._alive = (1 << len(self._docs)) - 1
+
+    def _bits_for(self, document):
+        keys = []
+        sector = normalize(document.get("sector"))
+        if sector:
+            keys.append(("sector", sector))
+        country = normalize(document.get("country"))
+        if country:
+            keys.append(("country", country))
+        for field, name in (("funding_range", "funding"), ("employees", "employees")):
+            for b in range_buckets(document.get(field)):
+                keys.append((name, b))
+        score = document.get("reputation_score")
+        keys.append(("reputation", reputation_band(score)))
+        return keys
+
+    def _table(self, name):
+        return {
+            "sector": self._sector,
+            "country": self._country,
+            "funding": self._funding,
+            "employees": self._employees,
+            "reputation": self._reputation,
+        }[name]
+
+    def _set(self, keys, bit, on):
+        for name, key in keys:
+            table = self._table(name)
+            current = table.get(key, 0) if isinstance(table, dict) else table[key]
+            table[key] = current | bit if on else current & ~bit
+
+    def add(self, document):
+        """Insert or replace a startup, keyed by companyName"""
+        name = document.get("companyName")
+        if not name:
+            return
+        with self._lock:
+            position = self._positions.get(name)
+            if position is None:
+                position = len(self._docs)
+                self._positions[name] = position
+                self._docs.append(None)
+                self._keys.append([])
+            bit = 1 << position
+            self._set(self._keys[position], bit, False)
+            keys = self._bits_for(document)
+            self._set(keys, bit, True)
+            self._keys[position] = keys
+            self._docs[position] = {k: v for k, v in document.items() if k != "_id"}
+            self._alive |= bit
+
+    def update_reputation(self, company_name, score):
+        with self._lock:
+            position = self._positions.get(company_name)
+        if position is not None:
+            self.add({**self._docs[position], "reputation_score": score})
+
+    def _levels(self, name, query_bits, near_bits=0):
+        """(bitset, credit) options for one criterion: full, adjacent, no match"""
+        full = query_bits & self._alive
+        near = near_bits & self._alive & ~full
+        levels = [(full, 1.0)]
+        if near:
+            levels.append((near, ADJACENT_CREDIT))
+        levels.append((self._alive & ~(full | near), 0.0))
+        return [(bits, credit * self.weights[name]) for bits, credit in levels]
+
+    def _range_levels(self, name, table, value):
+        interval = parse_range(value)
+        if not interval:
+            return None
+        span = bucket_span(interval)
+        full = 0
+        for b in span:
+            full |= table[b]
+        near = 0
+        for b in (span.start - 1, span.stop):
+            if 0 <= b <= MAX_BUCKET:
+                near |= table[b]
+        return self._levels(name, full, near)
+
+    def search(self, sector=None, country=None, funding_range=None, employees=None, top_k=20, use_reputation=False):
+        """Top-K startups by weighted match score, best first"""
+        criteria = []
+        if sector:
+            criteria.append(self._levels("sector", self._sector.get(normalize(sector), 0)))
+        if country:
+            criteria.append(self._levels("country", self._country.get(normalize(country), 0)))
+        for name, table, value in (("funding", self._funding, funding_range), ("employees", self._employees, employees)):
+            if value:
+                levels = self._range_levels(name, table, value)
+                if levels:
+                    criteria.append(levels)
+        if use_reputation:
+            band_weight = self.weights["reputation"] / (REPUTATION_BANDS - 1)
+            criteria.append([(self._reputation[band], band * band_weight) for band in range(REPUTATION_BANDS)]
+                            + [(self._reputation[REPUTATION_BANDS], 0.0)])
+
+        max_score = sum(max(credit for _, credit in levels) for levels in criteria) or 1.0
+
+        # Every combination of levels is a tier of startups sharing one score
+        tiers = []
+        for combination in itertools.product(*criteria):
+            score = sum(credit for _, credit in combination)
+            if criteria and score == 0:
+                continue
+            bits = self._alive
+            for level_bits, _ in combination:
+                bits &= level_bits
+                if not bits:
+                    break
+            if bits:
+                tiers.append((score, bits))
+        tiers.sort(key=lambda tier: tier[0], reverse=True)
+
+        matches = []
+        for score, bits in tiers:
+            while bits and len(matches) < top_k:
+                low = bits & -bits
+                bits ^= low
+                document = self._docs[low.bit_length() - 1]
+                matches.append({**document, "match_score": round(100 * score / max_score, 1)})
+            if len(matches) >= top_k:
+                break
+        return matches
+
+def reputation_band(score):
+    """Band 0..REPUTATION_BANDS-1 for a 0-100 score; REPUTATION_BANDS when unknown"""
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        return REPUTATION_BANDS
+    if not math.isfinite(score):
+        return REPUTATION_BANDS
+    return max(0, min(int(score // (100 / REPUTATION_BANDS)), REPUTATION_BANDS - 1))
+
+
+match_index = MatchIndex()
@@ -1,8 +1,16 @@
-# === backend/services/news_service.py ===
-import requests
+import os
 from config import NEWSAPI_KEY, GNEWS_API_KEY
+from services.http_client import get_client
+from services.cache import cached_fetch
+from services.rate_limit import limiter
+from services.metrics import upstream_errors
+from services.resilience import http_timeout
 
-def fetch_newsapi_data(query: str):
+# Overridable so benchmarks can point at local stand-ins (benchmarks/fake_providers.py)
+NEWSAPI_URL = os.getenv("NEWSAPI_URL", "https://newsapi.org/v2/everything")
+GNEWS_URL = os.getenv("GNEWS_URL", "https://gnews.io/api/v4/search")
+
+def newsapi_params(query: str, since: str = None):
     params = {
         "q": query,
         "apiKey": NEWSAPI_KEY,
@@ -10,26 +18,49 @@ def fetch_newsapi_data(query: str):
         "sortBy": "publishedAt",
         "language": "en"
     }
-    response = requests.get("https://newsapi.org/v2/everything", params=params)
-    if response.status_code == 200:
-        articles = response.json().get("articles", [])
+    if since:
+        params["from"] = since
+    return params
 
-        return {"source": "NewsAPI", "results": articles}
-    else:
-        return {"source": "NewsAPI", "error": response.status_code}
-
-def fetch_gnews_data(query: str):
+def gnews_params(query: str, since: str = None):
     params = {
         "q": query,
         "token": GNEWS_API_KEY,
         "lang": "en",
         "max": 20
     }
-    response = requests.get("https://gnews.io/api/v4/search", params=params)
+    if since:
+        params["from"] = since
+    return params
+
+@cached_fetch("newsapi")
+async def fetch_newsapi_data_async(query: str, since: str = None):
+    """NewsAPI articles for ``query``, fetched on the shared connection pool.
+
+    ``since`` (ISO 8601) asks only for articles published from that time on.
+    """
+    async with limiter("newsapi"):
+        response = await get_client().get(NEWSAPI_URL, params=newsapi_params(query, since), timeout=http_timeout("newsapi"))
+    if response.status_code == 200:
+        articles = response.json().get("articles", [])
+
+        return {"source": "NewsAPI", "results": articles}
+    else:
+        upstream_errors.inc(provider="newsapi", status=str(response.status_code))
+        return {"source": "NewsAPI", "error": response.status_code}
+
+@cached_fetch("gnews")
+async def fetch_gnews_data_async(query: str, since: str = None):
+    """GNews articles for ``query``, fetched on the shared connection pool.
+
+    ``since`` (ISO 8601) asks only for articles published from that time on.
+    """
+    async with limiter("gnews"):
+        response = await get_client().get(GNEWS_URL, params=gnews_params(query, since), timeout=http_timeout("gnews"))
     if response.status_code == 200:
         articles = response.json().get("articles", [])
 
         return {"source": "GNews", "results": articles}
     else:
+        upstream_errors.inc(provider="gnews", status=str(response.status_code))
         return {"source": "GNews", "error": response.status_code}
-
@@ -0,0 +1,147 @@
+import asyncio
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+# "background" for batch and refresh work and for hedged copies of slow calls;
+# those calls leave tokens for /analyze.
+_priority = ContextVar("rate_priority", default="interactive")
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens/sec up to ``burst``"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take one token and return how long the caller must wait before using it"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self):
+        """Give back a reserved token whose caller gave up before using it"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def try_take(self, keep=0):
+        """Take a token only if ``keep`` tokens remain afterwards.
+
+        Returns 0 on success, else the wait before it is worth trying again.
+        Nothing is reserved while waiting, so giving up needs no refund.
+        """
+        keep = min(keep, self.burst - 1)
+        with self._lock:
+            self._refill()
+            if self._tokens - 1 >= keep:
+                self._tokens -= 1
+                return 0.0
+            return (keep + 1 - self._tokens) / self.rate
+
+async def background(awaitable):
+    """Await ``awaitable`` at background priority; wrap a task's coroutine in it"""
+    token = _priority.set("background")
+    try:
+        return await awaitable
+    finally:
+        _priority.reset(token)
+
+class ProviderLimiter:
+    """Rate limit plus concurrency cap for one upstream API.
+
+    Use ``async with`` from coroutines and plain ``with`` from worker threads.
+    Interactive calls reserve a token up front and queue behind each other;
+    background calls (see ``background``) only take a token when at least
+    ``interactive_reserve`` would remain, so batch and refresh work cannot
+    drain the bucket in front of an /analyze request.
+    """
+
+    def __init__(self, rate, burst, concurrency, interactive_reserve=1):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.interactive_reserve = interactive_reserve
+        self._async_slots = None
+        self._thread_slots = threading.BoundedSemaphore(concurrency)
+        self.waited = 0.0
+
+    async def _wait_for_token(self):
+        if _priority.get() == "background":
+            while True:
+                delay = self.bucket.try_take(self.interactive_reserve)
+                if not delay:
+                    return
+                self.waited += delay
+                await asyncio.sleep(delay)
+        delay = self.bucket.reserve()
+        if delay:
+            self.waited += delay
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Timed out, hedged or disconnected: don't leave the token as debt
+                self.bucket.refund()
+                raise
+
+    async def __aenter__(self):
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.concurrency)
+        await self._async_slots.acquire()
+        try:
+            await self._wait_for_token()
+        except BaseException:
+            self._async_slots.release()
+            raise
+
+    async def __aexit__(self, *exc):
+        self._async_slots.release()
+
+    def __enter__(self):
+        self._thread_slots.acquire()
+        if _priority.get() == "background":
+            while True:
+                delay = self.bucket.try_take(self.interactive_reserve)
+                if not delay:
+                    break
+                self.waited += delay
+                time.sleep(delay)
+        else:
+            delay = self.bucket.reserve()
+            if delay:
+                self.waited += delay
+                time.sleep(delay)
+
+    def __exit__(self, *exc):
+        self._thread_slots.release()
+
+def _limits(provider, rate, burst, concurrency):
+    prefix = f"{provider.upper()}_RATE"
+    return ProviderLimiter(
+        rate=float(os.getenv(f"{prefix}_PER_SEC", rate)),
+        burst=float(os.getenv(f"{prefix}_BURST", burst)),
+        concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+        interactive_reserve=float(os.getenv(f"{prefix}_INTERACTIVE_RESERVE", 1)),
+    )
+
+# Defaults sit under each provider's published free-tier quota
+PROVIDER_LIMITERS = {
+    "gnews": _limits("gnews", 1.0, 5, 4),
+    "newsapi": _limits("newsapi", 1.0, 5, 4),
+    "twitter": _limits("twitter", 0.5, 3, 2),
+    "gemini": _limits("gemini", 0.25, 2, 2),
+}
+
+def limiter(provider):
+    return PROVIDER_LIMITERS[provider]
@@ -0,0 +1,210 @@
+import functools
+import os
+import re
+import string
+import threading
+
+import numpy as np
+
+SECTOR_KEYWORDS = {
+    "technology": ["tech", "software", "ai", "digital", "innovation"],
+    "aviation": ["airline", "flight", "aircraft", "airport", "aviation"],
+    "finance": ["bank", "financial", "money", "investment", "credit"],
+    "healthcare": ["health", "medical", "hospital", "pharma", "medicine"],
+    "retail": ["store", "shopping", "customer", "sales", "retail"],
+    "energy": ["energy", "oil", "gas", "renewable", "power"],
+    "automotive": ["car", "vehicle", "auto", "transport", "mobility"]
+}
+
+# Points per matched category; each category counts at most once per text
+DEFAULT_WEIGHTS = {
+    "company": 10,
+    "ceo": 8,
+    "ticker": 6,
+    "ceo_surname": 4,
+    "sector": 3,
+    "long_text": 2,
+}
+
+def parse_weights(value):
+    """Weights from "company=12,ticker=0"-style text or a dict; unknown or bad entries are ignored"""
+    if isinstance(value, dict):
+        entries = value.items()
+    else:
+        entries = (entry.partition("=")[::2] for entry in str(value or "").split(","))
+    weights = {}
+    for name, points in entries:
+        name = str(name).strip()
+        if name in DEFAULT_WEIGHTS:
+            try:
+                weights[name] = int(points)
+            except (TypeError, ValueError):
+                pass
+    return weights
+
+# RELEVANCE_WEIGHTS overrides single categories, e.g. "sector=5,long_text=0"
+RELEVANCE_WEIGHTS = {**DEFAULT_WEIGHTS, **parse_weights(os.getenv("RELEVANCE_WEIGHTS"))}
+
+LONG_TEXT_CHARS = 100
+# Scores remembered per company profile for texts seen again (cached fetches, refreshes)
+RELEVANCE_MEMO_SIZE = int(os.getenv("RELEVANCE_MEMO_SIZE", "4096"))
+
+# Legal suffixes dropped to derive a short company name ("Acme Corp" -> "Acme")
+COMPANY_SUFFIXES = {
+    "inc", "inc.", "corp", "corp.", "corporation", "co", "co.", "company", "ltd", "ltd.",
+    "limited", "llc", "plc", "gmbh", "ag", "sa", "group", "holdings", "technologies",
+}
+
+# Punctuation becomes whitespace so str.split() yields word tokens at C speed
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation + "‘’“”–—…" if c != "_"})
+
+# Texts of a batch are joined with NUL, which no match may cross
+_GAP = r"[^\w\x00]+"
+
+def _tokens(term):
+    return tuple(term.lower().translate(_PUNCTUATION).split())
+
+def _nested(outer, inner):
+    n = len(inner)
+    return outer != inner and any(outer[i:i + n] == inner for i in range(len(outer) - n + 1))
+
+def _compile(phrases):
+    """One alternation matching any of ``phrases`` (token tuples) on word boundaries.
+
+    A match also consumes the rest of its text, so the scan resumes at the
+    next text as soon as one term is found.
+    """
+    alternatives = []
+    for tokens in sorted(phrases, key=lambda tokens: (-len(" ".join(tokens)), tokens)):
+        first = re.escape(tokens[0])
+        # Lookbehind after the literal, so re can still search for the literal first
+        alternatives.append(first + r"(?<!\w" + first + ")" + "".join(_GAP + re.escape(token) for token in tokens[1:]))
+    return re.compile("(?:" + "|".join(alternatives) + r")(?!\w)[^\x00]*")
+
+def _matched(pattern, joined, lengths):
+    """Which texts of ``joined`` contain a match: a match deletes at least one character"""
+    remaining = pattern.sub("", joined).split("\x00")
+    return np.fromiter(map(len, remaining), np.int64, len(lengths)) < lengths
+
+class RelevanceMatcher:
+    """Word-boundary relevance scorer compiled once per company profile.
+
+    Company names, aliases, the CEO name and sector keywords are compiled into
+    one alternation regex per category. ``score_batch`` joins the batch and runs
+    each regex over it once instead of scanning every text per keyword, and
+    words only match whole, so "ai" never matches inside "said". Scores of texts
+    already seen come from a small per-profile memo.
+    """
+
+    def __init__(self, company, ceo="", sector="", ticker="", aliases=(), weights=None, memo_size=RELEVANCE_MEMO_SIZE):
+        self.weights = {**RELEVANCE_WEIGHTS, **(weights or {})}
+        names = [company] + [alias for alias in aliases if alias.strip()]
+        words = company.split()
+        if len(words) > 1 and words[-1].lower() in COMPANY_SUFFIXES:
+            names.append(" ".join(words[:-1]))
+
+        terms = [(name, "company") for name in names]
+        terms += [(keyword, "sector") for keyword in SECTOR_KEYWORDS.get(sector.lower(), [])]
+        if ceo.strip():
+            terms.append((ceo, "ceo"))
+            ceo_words = ceo.split()
+            if len(ceo_words) > 1 and len(ceo_words[-1]) > 2:
+                terms.append((ceo_words[-1], "ceo_surname"))
+
+        by_category = {}
+        for term, category in terms:
+            tokens = _tokens(term)
+            if tokens:
+                by_category.setdefault(category, set()).add(tokens)
+        # A term containing another term of its category adds nothing ("Acme Corp" vs "Acme")
+        self._patterns = {
+            category: _compile([tokens for tokens in found if not any(_nested(tokens, inner) for inner in found)])
+            for category, found in by_category.items()
+        }
+        # Tickers are matched case-sensitively so "ON" does not hit "on"
+        self.ticker = ticker.strip().upper() if len(ticker.strip()) > 1 else ""
+        ticker_tokens = tuple(self.ticker.translate(_PUNCTUATION).split())
+        self._ticker_pattern = _compile([ticker_tokens]) if ticker_tokens else None
+
+        self.memo_size = memo_size
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    def _hits(self, texts):
+        """{category: bool array over texts}, each category's regex run once over the batch"""
+        count = len(texts)
+        hits = {category: np.zeros(count, bool) for category in self.weights if category != "long_text"}
+        if not count:
+            return hits
+        joined = "\x00".join(texts)
+        if joined.count("\x00") != count - 1:
+            return self._hits([text.replace("\x00", " ") for text in texts])
+        lengths = np.fromiter(map(len, texts), np.int64, count)
+        lowered, lowered_lengths = joined.lower(), lengths
+        if len(lowered) != len(joined):
+            # A few non-ASCII characters grow when lowercased ("İ")
+            lowered_lengths = np.fromiter((len(text.lower()) for text in texts), np.int64, count)
+        for category, pattern in self._patterns.items():
+            hits[category] = _matched(pattern, lowered, lowered_lengths)
+        if self._ticker_pattern:
+            hits["ticker"] = _matched(self._ticker_pattern, joined, lengths)
+        hits["ceo_surname"] &= ~hits["ceo"]
+        return hits
+
+    def _score_batch(self, texts):
+        hits = self._hits(texts)
+        lengths = np.fromiter(map(len, texts), np.int64, len(texts))
+        scores = (lengths > LONG_TEXT_CHARS) * self.weights["long_text"]
+        for category, found in hits.items():
+            scores += found * self.weights[category]
+        return scores.tolist()
+
+    def score_batch(self, texts):
+        """Relevance score per text, in order; texts not in the memo are scored in one pass"""
+        texts = list(texts)
+        scores = list(map(self._memo.get, texts))
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            fresh = self._score_batch([texts[i] for i in missing])
+            with self._memo_lock:
+                for i, score in zip(missing, fresh):
+                    scores[i] = self._memo[texts[i]] = score
+                while len(self._memo) > self.memo_size:
+                    del self._memo[next(iter(self._memo))]
+        return scores
+
+    def score(self, text):
+        return self.score_batch([text])[0]
+
+    def categories_batch(self, texts):
+        """Set of term categories found in each text (ceo_surname only without the full ceo name)"""
+        texts = list(texts)
+        hits = self._hits(texts)
+        return [{category for category, found in hits.items() if found[i]} for i in range(len(texts))]
+
+    def categories(self, text):
+        return self.categories_batch([text])[0]
+
+
+@functools.lru_cache(maxsize=256)
+def get_matcher(company, ceo="", sector="", ticker="", aliases=(), weights=()):
+    return RelevanceMatcher(company, ceo, sector, ticker, aliases, dict(weights))
+
+def matcher_for(company_data):
+    """Cached matcher for a company profile.
+
+    ``aliases`` may be a list or comma-separated string; ``relevanceWeights``
+    (a dict or "name=points" string) overrides RELEVANCE_WEIGHTS per request.
+    """
+    aliases = company_data.get("aliases") or ()
+    if isinstance(aliases, str):
+        aliases = aliases.split(",")
+    weights = parse_weights(company_data.get("relevanceWeights"))
+    return get_matcher(
+        company_data.get("companyName", ""),
+        company_data.get("ceo", "") or "",
+        company_data.get("sector", "") or "",
+        company_data.get("ticker", "") or "",
+        tuple(sorted(str(alias).strip() for alias in aliases if str(alias).strip())),
+        tuple(sorted(weights.items())),
+    )
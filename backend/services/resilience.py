@@ -0,0 +1,142 @@
+"""Per-provider connect/read deadlines, circuit breakers and hedged requests.
+
+Every value can be overridden per provider from the environment, e.g.
+GNEWS_CONNECT_TIMEOUT, GNEWS_READ_TIMEOUT, GNEWS_CIRCUIT_FAILURES,
+GNEWS_CIRCUIT_RESET and GNEWS_HEDGE_AFTER_MS.
+"""
+import asyncio
+import os
+import time
+from contextvars import ContextVar
+
+import httpx
+
+from services.rate_limit import background
+
+# (connect, read) seconds for one HTTP attempt
+DEFAULT_DEADLINES = {
+    "gnews": (2.0, 5.0),
+    "newsapi": (2.0, 5.0),
+    "twitter": (2.0, 4.0),
+    "gemini": (3.0, 60.0),
+}
+
+def _setting(provider, name, default):
+    return float(os.getenv(f"{provider.upper()}_{name}", default))
+
+def deadlines(provider):
+    """(connect, read) timeout seconds"""
+    connect, read = DEFAULT_DEADLINES[provider]
+    return _setting(provider, "CONNECT_TIMEOUT", connect), _setting(provider, "READ_TIMEOUT", read)
+
+# Event loop time by which the current request must answer (see within_deadline)
+_deadline = ContextVar("request_deadline", default=None)
+
+async def within_deadline(deadline, awaitable):
+    """Await ``awaitable`` with every upstream read deadline capped at ``deadline``"""
+    token = _deadline.set(deadline)
+    try:
+        return await awaitable
+    finally:
+        _deadline.reset(token)
+
+def time_remaining():
+    """Seconds left of the current request budget, or None outside one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+def http_timeout(provider):
+    """httpx timeout with the provider's connect and read deadlines, the read
+    deadline cut to what is left of the request budget"""
+    connect, read = deadlines(provider)
+    remaining = time_remaining()
+    if remaining is not None:
+        read = max(0.1, min(read, remaining))
+    return httpx.Timeout(read, connect=min(connect, read))
+
+class CircuitBreaker:
+    """Closed until ``failure_threshold`` consecutive failures, then open: calls
+    are refused for ``reset_after`` seconds. After that a single trial call is
+    let through (half-open); its outcome closes or re-opens the circuit.
+
+    Only used from the event loop, so no locking.
+    """
+
+    def __init__(self, failure_threshold=5, reset_after=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def release(self):
+        """Forget a trial call that was cancelled before it finished"""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+BREAKERS = {
+    provider: CircuitBreaker(
+        failure_threshold=int(_setting(provider, "CIRCUIT_FAILURES", 5)),
+        reset_after=_setting(provider, "CIRCUIT_RESET", 30),
+    )
+    for provider in DEFAULT_DEADLINES
+}
+
+def breaker(provider):
+    return BREAKERS[provider]
+
+def hedge_after(provider):
+    """Seconds after which a second copy of a slow call is started; 0 disables hedging"""
+    return _setting(provider, "HEDGE_AFTER_MS", 0) / 1000
+
+async def hedged(call, delay):
+    """Await ``call()``; if it is still running after ``delay`` seconds, race a
+    second copy and return whichever succeeds first. The loser is cancelled.
+    The copy takes its own rate-limit token at background priority, so it
+    never spends the reserve kept for interactive calls and is never sent
+    without a token.
+    """
+    if not delay:
+        return await call()
+    tasks = {asyncio.ensure_future(call())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.add(asyncio.ensure_future(background(call())))
+        while True:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None or not tasks:
+                    return task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
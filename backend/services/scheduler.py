@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+class RefreshScheduler:
+    """Periodically runs ``refresh(company)`` for every company ``list_companies()`` returns.
+
+    Companies are refreshed ``concurrency`` at a time; a failure is logged
+    and does not stop the rest of the round.
+    """
+
+    def __init__(self, interval, list_companies, refresh, concurrency=2):
+        self.interval = interval
+        self.list_companies = list_companies
+        self.refresh = refresh
+        self.concurrency = concurrency
+        self.rounds = 0
+        self.last_round = None
+        self._task = None
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self):
+        companies = await asyncio.to_thread(self.list_companies)
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_one(company):
+            async with slots:
+                try:
+                    await self.refresh(company)
+                except Exception as e:
+                    print(f"❌ Refresh failed for {company.get('companyName')}: {e}")
+
+        started = time.monotonic()
+        await asyncio.gather(*(refresh_one(company) for company in companies))
+        self.rounds += 1
+        self.last_round = {"companies": len(companies), "seconds": round(time.monotonic() - started, 2)}
+        print(f"🔄 Refreshed {len(companies)} startups in {self.last_round['seconds']}s")
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"❌ Refresh round failed: {e}")
@@ -1,5 +1,13 @@
-import requests
+import os
+from datetime import datetime, timedelta, timezone
 from config import BEARER_TOKEN
+from services.http_client import get_client
+from services.cache import cached_fetch
+from services.rate_limit import limiter
+from services.metrics import upstream_errors
+from services.resilience import http_timeout
+
+TWITTER_SEARCH_URL = os.getenv("TWITTER_SEARCH_URL", "https://api.twitter.com/2/tweets/search/recent")
 
 #result = "[{'created_at': '2025-06-27T10:29:50.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938545300676759728', 'lang': 'en', 'edit_history_tweet_ids': ['1938545300676759728']}, {'created_at': '2025-06-27T10:26:15.000Z', 'text': '@Pratik4y @Srjitesh @AvudaiI15506 @TilotamaG @IncomeTaxIndia @nsitharaman @nsitharamanoffc @RBI @PMOIndia @DasShaktikanta @Infosys @FinMinIndia Bhai koi solution mila?', 'id': '1938544398028984386', 'lang': 'fi', 'edit_history_tweet_ids': ['1938544398028984386']}, {'created_at': '2025-06-27T10:25:55.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938544315254653309', 'lang': 'en', 'edit_history_tweet_ids': ['1938544315254653309']}, {'created_at': '2025-06-27T10:25:14.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938544143329787973', 'lang': 'en', 'edit_history_tweet_ids': ['1938544143329787973']}, {'created_at': '2025-06-27T10:24:43.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938544012023251073', 'lang': 'en', 'edit_history_tweet_ids': ['1938544012023251073']}, {'created_at': '2025-06-27T10:23:57.000Z', 'text': 'RT @GIFTCity_: Shri N.R. Narayana Murthy, Founder-Infosys, visited GIFT City today and lauded its evolution as a global financial and tech…', 'id': '1938543819437564410', 'lang': 'en', 'edit_history_tweet_ids': ['1938543819437564410']}, {'created_at': '2025-06-27T10:23:32.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543713170637239', 'lang': 'en', 'edit_history_tweet_ids': ['1938543713170637239']}, {'created_at': '2025-06-27T10:23:02.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543588486615066', 'lang': 'en', 'edit_history_tweet_ids': ['1938543588486615066']}, {'created_at': '2025-06-27T10:22:56.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543563215868263', 'lang': 'en', 'edit_history_tweet_ids': ['1938543563215868263']}, {'created_at': '2025-06-27T10:22:00.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543329513488805', 'lang': 'en', 'edit_history_tweet_ids': ['1938543329513488805']}, {'created_at': '2025-06-27T10:21:33.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543216212799799', 'lang': 'en', 'edit_history_tweet_ids': ['1938543216212799799']}, {'created_at': '2025-06-27T10:21:21.000Z', 'text': '@TVMohandasPai Dei Monkey....it is because of his Socialist polices that desis, barely literate indian lower, middle class got job security thru PSUs. \nTheir children could later become IIT grads join Infosys cookies and poo upon Nehru.', 'id': '1938543165784354826', 'lang': 'en', 'edit_history_tweet_ids': ['1938543165784354826']}, {'created_at': '2025-06-27T10:21:16.000Z', 'text': 'RT @KiranWeatherman: List of MNC IT companies in Vizag :\n\nInfosys ✅\nWipro ✅\nTech Mahindra ✅\nTCS  🔄\nCognizant 🔄\nHCL 🔄\n\n( Hopefully Deloitte…', 'id': '1938543142611108056', 'lang': 'en', 'edit_history_tweet_ids': ['1938543142611108056']}, {'created_at': '2025-06-27T10:20:42.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543000113623098', 'lang': 'en', 'edit_history_tweet_ids': ['1938543000113623098']}, {'created_at': '2025-06-27T10:20:21.000Z', 'text': 'Infosys valo se kuch kaam nahi hota dhang se', 'id': '1938542914902401433', 'lang': 'in', 'edit_history_tweet_ids': ['1938542914902401433']}, {'created_at': '2025-06-27T10:19:44.000Z', 'text': "RT @_amitbehere: Indians having an opinion about NYC mayor elections. \n\nBhai loog, don't mean to be an elitist asshole (or maybe I do),\n\nNY…", 'id': '1938542757565383059', 'lang': 'en', 'edit_history_tweet_ids': ['1938542757565383059']}, {'created_at': '2025-06-27T10:19:13.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938542629735788984', 'lang': 'en', 'edit_history_tweet_ids': ['1938542629735788984']}, {'created_at': '2025-06-27T10:17:07.000Z', 'text': 'छत्रपती संभाजीनगर मध्ये आता IT पार्क आलं पाहिजे.\n\n#ITPark \n#ChhatrapatiSambhajinagar\n#TCS\n#Cognizant \n#Infosys \n#HCL\n#HCLTech \n#LTIMindtree \n#Nasscom \n#startup \n#StartupSupport \n#auric\n\n@cssmartcity \n@PiyushGoyal \n@nasscom \n@The_CSN_Index \n@TheMahaIndex \n@Indian_Index \n@pmo https://t.co/O7nXB3PvY8', 'id': '1938542098313015754', 'lang': 'mr', 'edit_history_tweet_ids': ['1938542098313015754']}, {'created_at': '2025-06-27T10:16:14.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938541878791864554', 'lang': 'en', 'edit_history_tweet_ids': ['1938541878791864554']}, {'created_at': '2025-06-27T10:16:07.000Z', 'text': 'India’s IT sector is under pressure—Nifty IT down 10%+ YTD as TCS, Infosys, &amp; Wipro all drop double digits. Weak demand &amp; global headwinds dominate. Where do you see value? #ITSector #NiftyIT #StockMarket', 'id': '1938541847103553583', 'lang': 'en', 'edit_history_tweet_ids': ['1938541847103553583']}] [{'created_at': '2025-06-27T10:29:50.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938545300676759728', 'lang': 'en', 'edit_history_tweet_ids': ['1938545300676759728']}, {'created_at': '2025-06-27T10:26:15.000Z', 'text': '@Pratik4y @Srjitesh @AvudaiI15506 @TilotamaG @IncomeTaxIndia @nsitharaman @nsitharamanoffc @RBI @PMOIndia @DasShaktikanta @Infosys @FinMinIndia Bhai koi solution mila?', 'id': '1938544398028984386', 'lang': 'fi', 'edit_history_tweet_ids': ['1938544398028984386']}, {'created_at': '2025-06-27T10:25:55.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938544315254653309', 'lang': 'en', 'edit_history_tweet_ids': ['1938544315254653309']}, {'created_at': '2025-06-27T10:25:14.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938544143329787973', 'lang': 'en', 'edit_history_tweet_ids': ['1938544143329787973']}, {'created_at': '2025-06-27T10:24:43.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938544012023251073', 'lang': 'en', 'edit_history_tweet_ids': ['1938544012023251073']}, {'created_at': '2025-06-27T10:23:57.000Z', 'text': 'RT @GIFTCity_: Shri N.R. Narayana Murthy, Founder-Infosys, visited GIFT City today and lauded its evolution as a global financial and tech…', 'id': '1938543819437564410', 'lang': 'en', 'edit_history_tweet_ids': ['1938543819437564410']}, {'created_at': '2025-06-27T10:23:32.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543713170637239', 'lang': 'en', 'edit_history_tweet_ids': ['1938543713170637239']}, {'created_at': '2025-06-27T10:23:02.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543588486615066', 'lang': 'en', 'edit_history_tweet_ids': ['1938543588486615066']}, {'created_at': '2025-06-27T10:22:56.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543563215868263', 'lang': 'en', 'edit_history_tweet_ids': ['1938543563215868263']}, {'created_at': '2025-06-27T10:22:00.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543329513488805', 'lang': 'en', 'edit_history_tweet_ids': ['1938543329513488805']}, {'created_at': '2025-06-27T10:21:33.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543216212799799', 'lang': 'en', 'edit_history_tweet_ids': ['1938543216212799799']}, {'created_at': '2025-06-27T10:21:21.000Z', 'text': '@TVMohandasPai Dei Monkey....it is because of his Socialist polices that desis, barely literate indian lower, middle class got job security thru PSUs. \nTheir children could later become IIT grads join Infosys cookies and poo upon Nehru.', 'id': '1938543165784354826', 'lang': 'en', 'edit_history_tweet_ids': ['1938543165784354826']}, {'created_at': '2025-06-27T10:21:16.000Z', 'text': 'RT @KiranWeatherman: List of MNC IT companies in Vizag :\n\nInfosys ✅\nWipro ✅\nTech Mahindra ✅\nTCS  🔄\nCognizant 🔄\nHCL 🔄\n\n( Hopefully Deloitte…', 'id': '1938543142611108056', 'lang': 'en', 'edit_history_tweet_ids': ['1938543142611108056']}, {'created_at': '2025-06-27T10:20:42.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938543000113623098', 'lang': 'en', 'edit_history_tweet_ids': ['1938543000113623098']}, {'created_at': '2025-06-27T10:20:21.000Z', 'text': 'Infosys valo se kuch kaam nahi hota dhang se', 'id': '1938542914902401433', 'lang': 'in', 'edit_history_tweet_ids': ['1938542914902401433']}, {'created_at': '2025-06-27T10:19:44.000Z', 'text': "RT @_amitbehere: Indians having an opinion about NYC mayor elections. \n\nBhai loog, don't mean to be an elitist asshole (or maybe I do),\n\nNY…", 'id': '1938542757565383059', 'lang': 'en', 'edit_history_tweet_ids': ['1938542757565383059']}, {'created_at': '2025-06-27T10:19:13.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938542629735788984', 'lang': 'en', 'edit_history_tweet_ids': ['1938542629735788984']}, {'created_at': '2025-06-27T10:17:07.000Z', 'text': 'छत्रपती संभाजीनगर मध्ये आता IT पार्क आलं पाहिजे.\n\n#ITPark \n#ChhatrapatiSambhajinagar\n#TCS\n#Cognizant \n#Infosys \n#HCL\n#HCLTech \n#LTIMindtree \n#Nasscom \n#startup \n#StartupSupport \n#auric\n\n@cssmartcity \n@PiyushGoyal \n@nasscom \n@The_CSN_Index \n@TheMahaIndex \n@Indian_Index \n@pmo https://t.co/O7nXB3PvY8', 'id': '1938542098313015754', 'lang': 'mr', 'edit_history_tweet_ids': ['1938542098313015754']}, {'created_at': '2025-06-27T10:16:14.000Z', 'text': 'RT @codewithsushi: VIT Vellore 2025 placement stats\nTCS Ninja - 2010 hires (3.3 LPA)\nCognizant - 675 hires (4.2 LPA)\nLTIMindtree - 543 hire…', 'id': '1938541878791864554', 'lang': 'en', 'edit_history_tweet_ids': ['1938541878791864554']}, {'created_at': '2025-06-27T10:16:07.000Z', 'text': 'India’s IT sector is under pressure—Nifty IT down 10%+ YTD as TCS, Infosys, &amp; Wipro all drop double digits. Weak demand &amp; global headwinds dominate. Where do you see value? #ITSector #NiftyIT #StockMarket', 'id': '1938541847103553583', 'lang': 'en', 'edit_history_tweet_ids': ['1938541847103553583']}]"
 
@@ -13,19 +21,34 @@ def create_headers():
     return result'''
 
 
-def fetch_tweets(query, max_results=1):
-    url = "https://api.twitter.com/2/tweets/search/recent"
-    headers = create_headers()
+def tweet_params(query, max_results, since=None):
     params = {
         "query": query,
         "max_results": max_results,
         "tweet.fields": "created_at,text,lang"
     }
-    response = requests.get(url, headers=headers, params=params)
+    if since:
+        # Recent search rejects start times older than seven days
+        oldest = (datetime.now(timezone.utc) - timedelta(days=7, minutes=-1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        params["start_time"] = max(since, oldest)
+    return params
+
+@cached_fetch("twitter")
+async def fetch_tweets_async(query, max_results=1, since=None):
+    """Recent tweets matching ``query``, fetched on the shared connection pool.
+
+    ``since`` (ISO 8601) asks only for tweets created from that time on; recent
+    search only reaches back seven days.
+    """
+    async with limiter("twitter"):
+        response = await get_client().get(
+            TWITTER_SEARCH_URL,
+            headers=create_headers(),
+            params=tweet_params(query, max_results, since),
+            timeout=http_timeout("twitter"),
+        )
     if response.status_code != 200:
+        upstream_errors.inc(provider="twitter", status=str(response.status_code))
         raise Exception(f"Twitter error: {response.status_code}")
 
-    print(response.json().get("data", []))
     return response.json().get("data", [])
-
-
@@ -0,0 +1,39 @@
+import os
+import sys
+import types
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# config.py holds real API keys and is not checked in; unit tests never call out
+try:
+    import config  # noqa: F401
+except ImportError:
+    config = types.ModuleType("config")
+    config.MONGO_KEY = "mongodb://127.0.0.1:1"
+    config.NEWSAPI_KEY = config.GNEWS_API_KEY = config.BEARER_TOKEN = "test"
+    config.GEMINI_API_KEY = config.OPENAI_API_KEY = config.OPENROUTER_API_KEY = "test"
+    sys.modules["config"] = config
+
+class FakeClock:
+    """Stands in for a module's ``time``; tests move ``now`` by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """fake_clock(module) replaces ``module.time`` with a FakeClock and returns it"""
+    def install(module):
+        clock = FakeClock()
+        monkeypatch.setattr(module, "time", clock)
+        return clock
+    return install
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from services import article_store
+from services.article_store import format_timestamp, parse_timestamp, store_articles
+
+class FakeArticles:
+    """Just enough of a collection for store_articles' upserts"""
+
+    def __init__(self, existing=()):
+        self.documents = {key: {} for key in existing}
+
+    def bulk_write(self, operations, ordered=True):
+        upserted = {}
+        for index, (query, update) in enumerate(operations):
+            if query["_id"] not in self.documents:
+                self.documents[query["_id"]] = dict(update["$setOnInsert"])
+                upserted[index] = query["_id"]
+        return SimpleNamespace(upserted_ids=upserted)
+
+@pytest.fixture
+def articles(monkeypatch):
+    monkeypatch.setattr(article_store, "UpdateOne", lambda query, update, upsert: (query, update))
+
+    def install(existing=()):
+        collection = FakeArticles(existing)
+        monkeypatch.setattr(article_store, "article_collection", collection)
+        return collection
+    return install
+
+def prediction(label):
+    return {"label": label, "confidence": 0.9, "scores": {"positive": 0.9}}
+
+def test_store_articles_returns_only_inserted_predictions(articles):
+    collection = articles(existing={"Acme::https://x/1"})
+    items = [
+        {"id": "https://x/1", "text": "already stored by another worker", "source": "news"},
+        {"id": None, "text": "no id, never stored", "source": "news"},
+        {"id": "https://x/2", "text": "new article", "source": "news", "timestamp": "2026-10-01T08:00:00Z"},
+        {"id": "tweet:3", "text": "new tweet", "source": "twitter"},
+    ]
+    predictions = [prediction("Positive"), prediction("Neutral"), prediction("Negative"), prediction("Positive")]
+
+    inserted = store_articles("Acme", items, predictions)
+
+    assert [p["label"] for p in inserted] == ["Negative", "Positive"]
+    assert set(collection.documents) == {"Acme::https://x/1", "Acme::https://x/2", "Acme::tweet:3"}
+    stored = collection.documents["Acme::https://x/2"]
+    assert stored["published_at"] == datetime(2026, 10, 1, 8, tzinfo=timezone.utc)
+    assert (stored["company"], stored["source"], stored["label"]) == ("Acme", "news", "Negative")
+
+def test_store_articles_twice_counts_nothing_the_second_time(articles):
+    articles()
+    items = [{"id": "https://x/1", "text": "article", "source": "news"}]
+    assert len(store_articles("Acme", items, [prediction("Positive")])) == 1
+    assert store_articles("Acme", items, [prediction("Positive")]) == []
+    assert store_articles("Acme", [{"id": None, "text": "x"}], [prediction("Positive")]) == []
+
+def test_timestamps_round_trip_as_utc():
+    parsed = parse_timestamp("2025-06-27T10:29:50.000Z")
+    assert parsed == datetime(2025, 6, 27, 10, 29, 50, tzinfo=timezone.utc)
+    assert format_timestamp(parsed) == "2025-06-27T10:29:50Z"
+    assert parse_timestamp("2025-06-27T10:29:50").tzinfo == timezone.utc
+    assert parse_timestamp("yesterday") is None and parse_timestamp(None) is None
@@ -0,0 +1,57 @@
+import asyncio
+
+from analyzers.batch_server import MicroBatcher
+
+class FakeEngine:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def predict(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [{"label": text.upper()} for text in texts]
+
+def test_callers_share_a_batch_and_get_their_own_predictions():
+    engine = FakeEngine()
+    batcher = MicroBatcher(engine, max_batch=64, max_wait=0.05)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.classify(["a", "b"]),
+            batcher.classify(["c"]),
+            batcher.classify(["d", "e", "f"]),
+        )
+
+    assert asyncio.run(scenario()) == [
+        [{"label": "A"}, {"label": "B"}],
+        [{"label": "C"}],
+        [{"label": "D"}, {"label": "E"}, {"label": "F"}],
+    ]
+    assert engine.batches == [["a", "b", "c", "d", "e", "f"]]
+    assert batcher.stats()["avg_batch_size"] == 6.0
+
+def test_max_batch_splits_the_queue():
+    engine = FakeEngine()
+    batcher = MicroBatcher(engine, max_batch=2, max_wait=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.classify([text]) for text in "abc"))
+
+    assert asyncio.run(scenario()) == [[{"label": "A"}], [{"label": "B"}], [{"label": "C"}]]
+    assert engine.batches == [["a", "b"], ["c"]]
+
+def test_model_errors_reach_every_caller_in_the_batch():
+    batcher = MicroBatcher(FakeEngine(fail=True), max_wait=0.05)
+
+    async def scenario():
+        return await asyncio.gather(batcher.classify(["a"]), batcher.classify(["b"]), return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert [str(error) for error in errors] == ["model crashed", "model crashed"]
+
+def test_empty_input_skips_the_worker():
+    batcher = MicroBatcher(FakeEngine())
+    assert asyncio.run(batcher.classify([])) == []
+    assert batcher._thread is None
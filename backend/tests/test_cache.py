@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from services import cache as cache_module
+from services.cache import FRESH, STALE, TTLCache, cached_fetch
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(cache_module)
+
+def counting_fetcher(cache, results=None):
+    calls = []
+
+    @cached_fetch("test", cache)
+    async def fetch(query, max_results=10, since=None):
+        calls.append((query, max_results, since))
+        return (results or {}).get(len(calls), {"results": [len(calls)]})
+
+    return fetch, calls
+
+def test_keys_bind_arguments_to_the_signature(clock):
+    fetch, calls = counting_fetcher(TTLCache(ttl=60))
+
+    async def scenario():
+        first = await fetch("Acme Corp")
+        assert await fetch("acme  corp", 10) == first
+        assert await fetch(query="ACME CORP", max_results=10, since=None) == first
+        await fetch("Acme Corp", max_results=20)
+        await fetch("Acme Corp", since="2026-01-01T00:00:00Z")
+
+    asyncio.run(scenario())
+    assert calls == [("Acme Corp", 10, None), ("Acme Corp", 20, None), ("Acme Corp", 10, "2026-01-01T00:00:00Z")]
+
+def test_stale_entries_are_served_while_refreshing(clock):
+    cache = TTLCache(ttl=60, stale_ttl=300)
+    fetch, calls = counting_fetcher(cache)
+
+    async def scenario():
+        assert await fetch("acme") == {"results": [1]}
+        clock.now += 120
+        # Stale: the old value comes back at once and a single refresh starts
+        assert await fetch("acme") == {"results": [1]}
+        assert await fetch("acme") == {"results": [1]}
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert await fetch("acme") == {"results": [2]}
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert cache.stats()["stale_hits"] == 2
+
+def test_expired_entries_and_errors_are_fetched_again(clock):
+    fetch, calls = counting_fetcher(TTLCache(ttl=60, stale_ttl=300), results={1: {"source": "GNews", "error": 429}})
+
+    async def scenario():
+        assert await fetch("acme") == {"source": "GNews", "error": 429}
+        assert await fetch("acme") == {"results": [2]}
+        clock.now += 361
+        assert await fetch("acme") == {"results": [3]}
+
+    asyncio.run(scenario())
+    assert len(calls) == 3
+
+def test_lookup_states_and_lru_bound(clock):
+    cache = TTLCache(maxsize=2, ttl=60, stale_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.lookup("a") == (1, FRESH)
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.lookup("b") == (None, None)
+    clock.now += 90
+    assert cache.lookup("a") == (1, STALE)
+    clock.now += 60
+    assert cache.lookup("a") == (None, None)
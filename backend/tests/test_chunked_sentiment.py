@@ -0,0 +1,40 @@
+from analyzers.chunked_sentiment import make_chunks, merge_lists, reduce_results
+
+def test_make_chunks_packs_in_order_within_budget():
+    texts = ["a" * 36, "b" * 36, "c" * 36, "d" * 400]  # 10, 10, 10 and 101 estimated tokens
+    assert make_chunks(texts, token_budget=20) == [texts[:2], [texts[2]], [texts[3]]]
+    assert make_chunks([], token_budget=20) == []
+
+def test_merge_lists_interleaves_and_dedupes():
+    merged = merge_lists([["Strong demand", "Hiring"], None, ["strong  demand", "Layoffs", "Lawsuit"]])
+    assert merged == ["Strong demand", "Hiring", "Layoffs", "Lawsuit"]
+    assert merge_lists([[str(i) for i in range(10)]]) == ["0", "1", "2", "3", "4"]
+
+def test_reduce_results_weights_scores_and_sums_counts():
+    parts = [
+        ({"score": 80, "brand_awareness_score": "70", "positive_count": 3, "negative_count": 1,
+          "confidence_level": "high", "most_positive": "great", "most_negative": "meh",
+          "key_insights": ["Growth"], "topic_scores": [{"topic": "Product", "score": 90}]}, 3),
+        ({"score": 20, "positive_count": 0, "negative_count": "4", "neutral_count": None,
+          "confidence_level": "low", "most_positive": "fine", "most_negative": "awful",
+          "key_insights": ["growth", "Churn"], "topic_scores": [{"topic": "product", "score": 30},
+                                                                 {"topic": "Pricing", "score": 10}]}, 1),
+    ]
+    merged = reduce_results(parts)
+    assert merged["score"] == 65
+    assert merged["brand_awareness_score"] == 70
+    assert "market_sentiment_score" not in merged
+    assert (merged["positive_count"], merged["negative_count"], merged["neutral_count"]) == (3, 5, 0)
+    assert merged["sentiment"] == "positive"
+    assert merged["confidence_level"] == "high"  # (2 * 3 + 0 * 1) / 4 = 1.5 -> level 2
+    assert (merged["most_positive"], merged["most_negative"]) == ("great", "awful")
+    assert merged["key_insights"] == ["Growth", "Churn"]
+    assert merged["topic_scores"] == [{"topic": "product", "score": 75}, {"topic": "pricing", "score": 10}]
+
+def test_reduce_results_defaults_without_scores():
+    merged = reduce_results([({"score": "n/a", "confidence_level": "unsure"}, 2)])
+    assert "score" not in merged
+    assert merged["sentiment"] == "neutral"
+    assert merged["confidence_level"] == "low"
+    assert "most_positive" not in merged
+    assert merged["key_insights"] == [] and merged["topic_scores"] == []
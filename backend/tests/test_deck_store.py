@@ -0,0 +1,29 @@
+import pytest
+
+from services.deck_store import byte_range
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    (" bytes=0-0 ", (0, 0)),
+])
+def test_single_ranges(header, expected):
+    assert byte_range(header, 1000) == expected
+
+@pytest.mark.parametrize("header", [None, "", "bytes=-", "bytes=0-1,5-9", "items=0-9", "bytes=a-b"])
+def test_whole_file(header):
+    assert byte_range(header, 1000) is None
+
+@pytest.mark.parametrize("header, length", [
+    ("bytes=1000-", 1000),
+    ("bytes=5-4", 1000),
+    ("bytes=-0", 1000),
+    ("bytes=-10", 0),
+    ("bytes=0-", 0),
+])
+def test_unsatisfiable(header, length):
+    with pytest.raises(ValueError):
+        byte_range(header, length)
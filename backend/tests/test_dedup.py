@@ -0,0 +1,26 @@
+from services.dedup import NearDuplicateIndex, simhash
+
+STORY = "Acme raises 50 million dollars in a series B round led by Global Ventures to expand its cloud platform"
+
+def test_simhash_is_stable_and_case_insensitive():
+    assert simhash(STORY) == simhash(STORY.upper())
+    assert simhash("") == 0
+
+def test_exact_and_near_copies_join_the_first_cluster():
+    index = NearDuplicateIndex(0.9)
+    assert index.add(STORY) == (0, True)
+    assert index.add(STORY) == (0, False)
+    assert index.add("BREAKING: " + STORY) == (0, False)
+
+def test_different_stories_get_new_clusters():
+    index = NearDuplicateIndex(0.9)
+    index.add(STORY)
+    assert index.add("Regulators open an inquiry into accounting practices at a retail chain") == (1, True)
+    assert index.add("Customers complain about app outages across Europe this week") == (2, True)
+
+def test_threshold_one_only_merges_identical_word_sets():
+    index = NearDuplicateIndex(1.0)
+    assert index.max_distance == 0
+    index.add(STORY)
+    assert index.add(STORY + " today")[1] is True
+    assert index.add(STORY.lower())[1] is False
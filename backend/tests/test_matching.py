@@ -0,0 +1,71 @@
+import math
+
+import pytest
+
+from services.matching import REPUTATION_BANDS, MatchIndex, bucket, bucket_span, parse_range, reputation_band
+
+@pytest.mark.parametrize("value, expected", [
+    ("1 - 5 Cr", (1e7, 5e7)),
+    ("$1M-$5M", (1e6, 5e6)),
+    ("11-50", (11, 50)),
+    ("5001+", (5001, math.inf)),
+    ("Less than 10", (0, 10)),
+    ("up to 10 L", (0, 1e6)),
+    ("Above 100 Cr", (1e9, math.inf)),
+    ("turnover 5 Cr", (5e7, 5e7)),
+    ("founder-led, 20", (20, 20)),
+    ("1,000-2,000", (1000, 2000)),
+])
+def test_parse_range(value, expected):
+    assert parse_range(value) == expected
+
+@pytest.mark.parametrize("value", [None, "", "undisclosed"])
+def test_parse_range_without_numbers(value):
+    assert parse_range(value) is None
+
+def test_bucket_span_excludes_the_upper_bound():
+    assert bucket(1e7) == bucket(1.5e7) != bucket(2e7)
+    assert list(bucket_span((1e7, 2e7))) == [bucket(1e7)]
+    assert list(bucket_span((1e7, 5e7))) == [bucket(1e7), bucket(2e7)]
+
+def test_bucket_span_single_value_and_open_end():
+    assert list(bucket_span((50, 50))) == [bucket(50)]
+    span = bucket_span((5001, math.inf))
+    assert span.start == bucket(5001) and span.stop - 1 == bucket(math.inf)
+
+@pytest.mark.parametrize("score, band", [
+    (0, 0), (55, 5), (99.9, 9), (100, 9), (150, 9), (-5, 0),
+    (None, REPUTATION_BANDS), ("n/a", REPUTATION_BANDS), (float("nan"), REPUTATION_BANDS),
+])
+def test_reputation_band(score, band):
+    assert reputation_band(score) == band
+
+def startups():
+    return [
+        {"companyName": "A", "sector": "Fintech", "country": "India", "funding_range": "1 - 5 Cr", "employees": "11-50"},
+        {"companyName": "B", "sector": "fintech", "country": "USA", "funding_range": "5 - 10 Cr", "employees": "51-200"},
+        {"companyName": "C", "sector": "Health", "country": "India", "funding_range": "1 - 5 Cr", "employees": "11-50"},
+    ]
+
+def test_search_ranks_full_matches_first():
+    index = MatchIndex()
+    index.load(startups())
+    results = index.search(sector="FinTech", country="india", funding_range="1 - 5 Cr", top_k=3)
+    # B: sector + adjacent funding bucket (0.35 + 0.125); C: country + funding (0.15 + 0.25)
+    assert [r["companyName"] for r in results] == ["A", "B", "C"]
+    assert [r["match_score"] for r in results] == [100.0, 63.3, 53.3]
+
+def test_load_keeps_the_last_duplicate_and_add_replaces():
+    index = MatchIndex()
+    index.load(startups() + [{"companyName": "A", "sector": "Health", "country": "USA"}])
+    assert len(index) == 3
+    assert [r["companyName"] for r in index.search(sector="health")][:2] == ["A", "C"]
+
+    index.add({"companyName": "A", "sector": "Fintech"})
+    assert [r["companyName"] for r in index.search(sector="health", top_k=1)] == ["C"]
+
+def test_update_reputation_moves_the_band():
+    index = MatchIndex()
+    index.load(startups())
+    index.update_reputation("C", 95)
+    assert index.search(use_reputation=True, top_k=1)[0]["companyName"] == "C"
@@ -0,0 +1,58 @@
+import pytest
+
+from services import metrics
+from services.metrics import CallbackCounter, Counter, Histogram, render, server_timing
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+
+def test_counter_renders_sorted_labelled_samples():
+    errors = Counter("errors_total", "Failed calls", ["provider", "status"])
+    errors.inc(provider="newsapi", status="429")
+    errors.inc(2, provider="gnews", status="timeout")
+    errors.inc(provider="newsapi", status="429")
+    assert errors.render() == [
+        "# HELP errors_total Failed calls",
+        "# TYPE errors_total counter",
+        'errors_total{provider="gnews",status="timeout"} 2',
+        'errors_total{provider="newsapi",status="429"} 2',
+    ]
+
+def test_label_values_are_escaped():
+    counter = Counter("texts_total", "Texts", ["stage"])
+    counter.inc(stage='say "hi"\\\n')
+    assert counter.render()[-1] == 'texts_total{stage="say \\"hi\\"\\\\\\n"} 1'
+
+def test_histogram_buckets_are_cumulative_with_inclusive_bounds():
+    latency = Histogram("stage_seconds", "Stage latency", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage="fetch")
+    assert latency.render()[2:] == [
+        'stage_seconds_bucket{stage="fetch",le="0.1"} 2',
+        'stage_seconds_bucket{stage="fetch",le="1.0"} 3',
+        'stage_seconds_bucket{stage="fetch",le="+Inf"} 4',
+        'stage_seconds_sum{stage="fetch"} 3.65',
+        'stage_seconds_count{stage="fetch"} 4',
+    ]
+
+def test_render_joins_every_metric_including_callbacks():
+    Counter("plain_total", "Plain").inc(3)
+    CallbackCounter("cache_hits_total", "Cache hits", ["cache"], lambda: {("fetch",): 7})
+    assert render() == (
+        "# HELP plain_total Plain\n# TYPE plain_total counter\nplain_total 3\n"
+        "# HELP cache_hits_total Cache hits\n# TYPE cache_hits_total counter\n"
+        'cache_hits_total{cache="fetch"} 7\n'
+    )
+
+def test_span_feeds_the_request_trace(monkeypatch):
+    monkeypatch.setattr(metrics, "stage_seconds", Histogram("stage_duration_seconds", "Stage latency", ["stage"]))
+    trace = []
+    token = metrics._trace.set(trace)
+    try:
+        with metrics.span("filter"):
+            pass
+    finally:
+        metrics._trace.reset(token)
+    assert [stage for stage, _ in trace] == ["filter"]
+    assert server_timing([("fetch.gnews", 0.0123)], 0.05) == "fetch.gnews;dur=12.3, total;dur=50.0"
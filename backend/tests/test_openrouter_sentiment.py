@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from analyzers import openrouter_sentiment
+from analyzers.openrouter_sentiment import shared_call
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Stands in for fetch_result; calls block until ``release`` is set"""
+    state = {"calls": [], "cancelled": [], "release": None}
+
+    async def fetch_result(key, prompt):
+        state["calls"].append(key)
+        try:
+            await state["release"].wait()
+        except asyncio.CancelledError:
+            state["cancelled"].append(key)
+            raise
+        return {"score": 70, "key": key}
+
+    monkeypatch.setattr(openrouter_sentiment, "fetch_result", fetch_result)
+    monkeypatch.setattr(openrouter_sentiment, "_inflight", {})
+    return state
+
+def test_concurrent_callers_share_one_call(upstream):
+    async def scenario():
+        upstream["release"] = asyncio.Event()
+        waiters = [asyncio.create_task(shared_call(key, "prompt")) for key in ("a", "a", "a", "b")]
+        await asyncio.sleep(0)
+        upstream["release"].set()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(scenario())
+    assert [result["key"] for result in results] == ["a", "a", "a", "b"]
+    assert sorted(upstream["calls"]) == ["a", "b"]
+    assert openrouter_sentiment._inflight == {}
+
+def test_call_is_cancelled_only_when_the_last_waiter_leaves(upstream):
+    async def scenario():
+        upstream["release"] = asyncio.Event()
+        first = asyncio.create_task(shared_call("a", "prompt"))
+        second = asyncio.create_task(shared_call("a", "prompt"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.sleep(0)
+        assert upstream["cancelled"] == []
+        assert "a" in openrouter_sentiment._inflight
+
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        await asyncio.sleep(0)
+        assert upstream["cancelled"] == ["a"]
+        assert openrouter_sentiment._inflight == {}
+
+        # A later caller starts a fresh call instead of joining the cancelled one
+        upstream["release"].set()
+        return await shared_call("a", "prompt")
+
+    assert asyncio.run(scenario())["key"] == "a"
+    assert upstream["calls"] == ["a", "a"]
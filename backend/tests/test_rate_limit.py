@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from services import rate_limit
+from services.rate_limit import ProviderLimiter, TokenBucket, background
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(rate_limit)
+
+def test_reserve_spends_the_burst_then_queues(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+def test_reserve_refills_at_rate_up_to_burst(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 10
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+def test_refund_cancels_a_queued_reservation(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.reserve()
+    assert bucket.reserve() == 1.0
+    bucket.refund()
+    assert bucket.reserve() == 1.0
+
+def test_refund_never_exceeds_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.refund()
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+def test_try_take_leaves_the_reserve(clock):
+    bucket = TokenBucket(rate=1, burst=3)
+    assert bucket.try_take(keep=1) == 0.0
+    assert bucket.try_take(keep=1) == 0.0
+    assert bucket.try_take(keep=1) == 1.0
+    # Nothing was taken by the failed attempt: interactive calls still get the last token
+    assert bucket.reserve() == 0.0
+
+def test_try_take_keep_is_clamped_below_burst(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.try_take(keep=5) == 0.0
+
+def test_cancelled_interactive_wait_refunds_its_token():
+    limiter = ProviderLimiter(rate=0.5, burst=1, concurrency=4)
+
+    async def scenario():
+        async with limiter:
+            pass
+        waiting = asyncio.create_task(limiter.__aenter__())
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return limiter.bucket.reserve()
+
+    # Only the first call's debt remains, not the cancelled one's
+    assert 1.9 < asyncio.run(scenario()) <= 2.0
+
+def test_background_keeps_a_token_for_interactive_calls():
+    limiter = ProviderLimiter(rate=100, burst=2, concurrency=1)
+
+    async def call():
+        async with limiter:
+            return True
+
+    async def scenario():
+        assert await background(call())
+        assert limiter.waited == 0
+        assert await background(call())
+        return limiter.waited
+
+    # The second background call waited: one token stays in reserve for interactive calls
+    assert asyncio.run(scenario()) > 0
@@ -0,0 +1,60 @@
+from services.relevance import LONG_TEXT_CHARS, RelevanceMatcher, matcher_for, parse_weights
+
+def acme():
+    return RelevanceMatcher("Acme Corp", ceo="Jane Doe", sector="technology", ticker="ACME")
+
+def test_company_name_and_short_name():
+    matcher = acme()
+    assert matcher.categories("Acme Corp posts record quarter") == {"company"}
+    assert matcher.categories("Shares of Acme rose") == {"company"}
+    assert matcher.score("Acme Corp posts record quarter") == 10
+
+def test_sector_keywords_match_whole_words_only():
+    matcher = acme()
+    assert matcher.categories("The CEO said nothing") == set()
+    assert matcher.categories("A new AI model") == {"sector"}
+
+def test_ticker_is_case_sensitive():
+    matcher = RelevanceMatcher("Onsemi", ticker="ON")
+    assert matcher.categories("ON shares jumped") == {"ticker"}
+    assert matcher.categories("carry on shares") == set()
+
+def test_surname_only_counts_without_full_ceo_name():
+    matcher = acme()
+    assert matcher.score("Doe spoke to reporters") == 4
+    assert matcher.score("Jane Doe spoke to reporters") == 8
+
+def test_long_text_bonus():
+    matcher = acme()
+    assert matcher.score("x" * (LONG_TEXT_CHARS + 1)) == 2
+    assert matcher.score("x" * LONG_TEXT_CHARS) == 0
+
+def test_matcher_for_accepts_comma_separated_aliases():
+    matcher = matcher_for({"companyName": "Globex", "aliases": "Globex Labs, GBX Holdings"})
+    assert matcher.categories("GBX Holdings files for IPO") == {"company"}
+    assert matcher is matcher_for({"companyName": "Globex", "aliases": ["GBX Holdings", "Globex Labs"]})
+
+def test_score_batch_matches_single_scores():
+    matcher = acme()
+    texts = ["Acme Corp posts record quarter", "The CEO said nothing", "Doe\x00Acme", "", "ACME and Jane Doe on AI"]
+    assert matcher.score_batch(texts) == [10, 0, 14, 0, 27]
+    assert matcher.score_batch(texts) == [acme().score(text) for text in texts]
+
+def test_score_batch_handles_text_that_grows_when_lowercased():
+    matcher = acme()
+    assert matcher.score_batch(["İİİİ news", "Acme Corp news"]) == [0, 10]
+
+def test_memo_is_bounded():
+    matcher = RelevanceMatcher("Acme", memo_size=2)
+    assert matcher.score_batch(["Acme one", "two", "Acme three"]) == [10, 0, 10]
+    assert list(matcher._memo) == ["two", "Acme three"]
+
+def test_parse_weights_ignores_unknown_and_bad_entries():
+    assert parse_weights("company=12, ticker=0,unknown=3,sector=x") == {"company": 12, "ticker": 0}
+    assert parse_weights({"ceo": "5", "bogus": 1}) == {"ceo": 5}
+    assert parse_weights(None) == {}
+
+def test_matcher_for_applies_weight_overrides():
+    matcher = matcher_for({"companyName": "Acme", "relevanceWeights": "company=1,long_text=0"})
+    assert matcher.score("Acme " + "x" * LONG_TEXT_CHARS) == 1
+    assert matcher is not matcher_for({"companyName": "Acme"})
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from services import rate_limit, resilience
+from services.rate_limit import ProviderLimiter
+from services.resilience import CircuitBreaker, hedged, http_timeout, time_remaining, within_deadline
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(resilience)
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_failed_probe_reopens_and_cancelled_probe_is_released(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_after=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 29
+    assert not breaker.allow()
+
+def test_hedged_without_delay_calls_once():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return "ok"
+
+    assert asyncio.run(hedged(call, 0)) == "ok"
+    assert calls == [1]
+
+def test_hedged_returns_the_faster_copy_and_cancels_the_other():
+    started, cancelled = [], []
+
+    async def call():
+        attempt = len(started)
+        started.append(rate_limit._priority.get())
+        try:
+            await asyncio.sleep(1.0 if attempt == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    async def scenario():
+        result = await hedged(call, 0.02)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(scenario()) == 1
+    assert started == ["interactive", "background"]
+    assert cancelled == [0]
+
+def test_hedged_skips_a_failed_copy_but_raises_when_both_fail():
+    async def flaky():
+        attempt = flaky.calls
+        flaky.calls += 1
+        if attempt == 1:
+            raise RuntimeError("hedge failed")
+        await asyncio.sleep(0.05)
+        return "slow but fine"
+    flaky.calls = 0
+    assert asyncio.run(hedged(flaky, 0.01)) == "slow but fine"
+
+    async def broken():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("down")
+    with pytest.raises(RuntimeError):
+        asyncio.run(hedged(broken, 0.01))
+
+def test_http_timeout_is_capped_by_the_request_budget():
+    async def scenario():
+        assert time_remaining() is None
+        loop = asyncio.get_running_loop()
+
+        async def inside():
+            return time_remaining(), http_timeout("gnews")
+
+        return await within_deadline(loop.time() + 1.0, inside())
+
+    remaining, timeout = asyncio.run(scenario())
+    assert 0.9 < remaining <= 1.0
+    assert timeout.read <= 1.0 and timeout.connect <= timeout.read
+
+def test_hedge_waits_for_its_own_token():
+    limiter = ProviderLimiter(rate=0.2, burst=1, concurrency=2)
+    upstream = []
+
+    async def call():
+        async with limiter:
+            upstream.append(rate_limit._priority.get())
+            await asyncio.sleep(0.1)
+            return "ok"
+
+    # The only token goes to the first call; the hedge is still waiting when it answers
+    assert asyncio.run(hedged(call, 0.02)) == "ok"
+    assert upstream == ["interactive"]
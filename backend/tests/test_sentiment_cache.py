@@ -0,0 +1,83 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from analyzers import gpt_sentiment, sentiment_cache
+from analyzers.sentiment_cache import SentimentCache, cached_scores
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    monkeypatch.setenv("SENTIMENT_CACHE_PATH", path)
+    monkeypatch.setattr(sentiment_cache, "_caches", {})
+    return path
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(sentiment_cache)
+
+def rows(cache):
+    return cache._connect().execute(f"SELECT value, used FROM {cache.table} ORDER BY value").fetchall()
+
+def test_entries_expire_after_max_age(tmp_path, clock):
+    cache = SentimentCache(str(tmp_path / "cache.db"), max_age=60)
+    cache.put_many(["Acme  is GREAT"], [{"label": "Positive"}], "model-a")
+    # Keys ignore case and whitespace; models are kept apart
+    assert cache.get_many(["acme is great", "other"], "model-a") == {0: {"label": "Positive"}}
+    assert cache.get_many(["acme is great"], "model-b") == {}
+    clock.now += 61
+    assert cache.get_many(["acme is great"], "model-a") == {}
+    assert cache.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25}
+    cache.evict()
+    assert rows(cache) == []
+
+def test_evict_keeps_the_most_recently_used_rows(tmp_path, clock):
+    cache = SentimentCache(str(tmp_path / "cache.db"), max_rows=2)
+    for value in "abc":
+        cache.put_many([value], [value], "model")
+        clock.now += 1
+    cache.get_many(["a"], "model")  # "a" is now the most recently used
+    cache.evict()
+    assert [value for value, _ in rows(cache)] == ['"a"', '"c"']
+
+def test_last_use_is_written_back_in_batches(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(sentiment_cache, "TOUCH_EVERY", 3)
+    cache = SentimentCache(str(tmp_path / "cache.db"))
+    cache.put_many(["a", "b", "c"], [1, 2, 3], "model")
+    created = clock.now
+    clock.now += 10
+    cache.get_many(["a", "b"], "model")
+    cache.get_many(["a"], "model")
+    assert [used for _, used in rows(cache)] == [created] * 3
+    clock.now += 10
+    cache.get_many(["c"], "model")  # third distinct entry: all touches are written at once
+    assert [used for _, used in rows(cache)] == [created + 10, created + 10, created + 20]
+
+def test_cached_scores_only_scores_misses(cache_path):
+    scored = []
+
+    def score(texts):
+        scored.append(list(texts))
+        return [len(text) for text in texts]
+
+    assert cached_scores(["aa", "bbb"], "model", score) == [2, 3]
+    assert cached_scores(["bbb", "c", "aa"], "model", score) == [3, 1, 2]
+    assert scored == [["aa", "bbb"], ["c"]]
+
+def test_gpt_caches_only_valid_json(cache_path, monkeypatch):
+    replies = ["Sure! The sentiment is positive.", '```json\n{"score": 70}\n```']
+
+    def create(**kwargs):
+        content = replies.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(gpt_sentiment, "get_client", lambda: client)
+
+    with pytest.raises(json.JSONDecodeError):
+        gpt_sentiment.analyze_sentiment(["Acme is great"])
+    # The malformed reply was not cached, so the next call asks again
+    assert gpt_sentiment.analyze_sentiment(["Acme is great"]) == {"score": 70}
+    assert not replies
+    assert gpt_sentiment.analyze_sentiment(["Acme is great"]) == {"score": 70}
@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+from analyzers.trends import bucket_trend, to_epoch
+
+def test_to_epoch_honours_offsets_and_marks_bad_values():
+    seconds = to_epoch(["1970-01-01T00:00:00Z", "1970-01-01T01:00:00+01:00", "1970-01-01T00:00:10", None, "soon"])
+    assert list(seconds[:3]) == [0.0, 0.0, 10.0]
+    assert math.isnan(seconds[3]) and math.isnan(seconds[4])
+
+def test_daily_buckets_use_utc():
+    trend = bucket_trend(
+        ["2025-06-27T23:30:00-02:00", "2025-06-28T00:30:00Z", "2025-06-27T10:00:00Z"],
+        [80, 60, 40],
+    )
+    assert trend == [
+        {"day": "2025-06-27", "sentiment": 40, "mentions": 1},
+        {"day": "2025-06-28", "sentiment": 70, "mentions": 2},
+    ]
+
+def test_mentions_weight_the_mean():
+    trend = bucket_trend(["2025-01-02T08:00:00Z", "2025-01-02T09:00:00Z"], [90, 30], mentions=[1, 3])
+    assert trend == [{"day": "2025-01-02", "sentiment": 45, "mentions": 4}]
+
+def test_hour_and_week_labels():
+    stamps = ["2025-01-02T00:15:00Z", "2025-01-02T00:45:00Z", "2025-01-05T12:00:00Z", "2025-01-06T00:00:00Z"]
+    hourly = bucket_trend(stamps, [50, 50, 50, 50], window="hour")
+    assert [point["day"] for point in hourly] == ["2025-01-02 00:00", "2025-01-05 12:00", "2025-01-06 00:00"]
+    # 2024-12-30 and 2025-01-06 are Mondays
+    weekly = bucket_trend(stamps, [20, 40, 60, 80], window="week")
+    assert weekly == [
+        {"day": "2024-12-30", "sentiment": 40, "mentions": 3},
+        {"day": "2025-01-06", "sentiment": 80, "mentions": 1},
+    ]
+
+def test_untimed_texts_are_skipped():
+    assert bucket_trend([None, ""], [10, 20]) == []
+    assert bucket_trend([None, "2025-01-02T00:00:00Z"], [10, 20]) == [{"day": "2025-01-02", "sentiment": 20, "mentions": 1}]
+
+def test_unknown_window():
+    with pytest.raises(ValueError):
+        bucket_trend([], [], window="month")